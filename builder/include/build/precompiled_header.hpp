@@ -0,0 +1,27 @@
+#pragma once
+
+#include <filesystem>
+#include <optional>
+#include <string>
+#include <vector>
+
+#include "core/context.hpp"
+
+namespace crosside::build {
+
+// Builds (or reuses) a precompiled header for `header` under `pchRoot` and
+// returns the stub header to pass as `-include <stub>` to C++ compiles.
+// `outputExt` is ".gch" for gcc and ".pch" for clang/emscripten.
+std::optional<std::filesystem::path> preparePrecompiledHeader(
+    const crosside::Context &ctx,
+    const std::string &compiler,
+    const std::filesystem::path &header,
+    const std::filesystem::path &pchRoot,
+    const std::vector<std::string> &flags,
+    const std::string &outputExt,
+    bool full
+);
+
+std::vector<std::filesystem::path> readDepfile(const std::filesystem::path &depfile);
+
+} // namespace crosside::build
@@ -47,6 +47,7 @@ struct ProjectSpec {
     std::vector<std::string> modules;
     std::vector<std::filesystem::path> src;
     std::vector<std::filesystem::path> include;
+    std::filesystem::path pchHeader;
 
     BuildArgs main;
     BuildArgs desktop;
@@ -71,6 +72,7 @@ struct ProjectSpec {
     std::unordered_map<std::string, std::string> androidManifestVars;
     std::filesystem::path androidContentRoot;
     std::filesystem::path desktopContentRoot;
+    int desktopUnityBatch = 0;
     std::string webShell;
     std::filesystem::path webContentRoot;
 };
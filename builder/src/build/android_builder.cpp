@@ -741,7 +741,7 @@ namespace crosside::build
                     return;
                 }
                 const fs::path path = fs::absolute(module.dir / rel);
-                if (!fs::exists(path) || !isCompilable(path))
+                if (!isCompilable(path) || !fs::exists(path))
                 {
                     return;
                 }
@@ -1024,7 +1024,7 @@ namespace crosside::build
 
             for (const auto &src : project.src)
             {
-                if (!fs::exists(src) || !isCompilable(src))
+                if (!isCompilable(src) || !fs::exists(src))
                 {
                     continue;
                 }
@@ -1065,6 +1065,61 @@ namespace crosside::build
                 return false;
             }
 
+            // The target/sysroot/hardening flags do not depend on the source, so
+            // build them once. Each source then gets the shared prefix, its own
+            // directory include, and the language tail (user flags included,
+            // empty ones dropped), followed by -c/-o.
+            std::vector<std::string> common;
+            common.push_back("-target");
+            common.push_back(abi.clangTarget);
+            common.push_back("--sysroot");
+            common.push_back(pathString(tc.sysroot));
+
+            common.push_back("-fdata-sections");
+            common.push_back("-ffunction-sections");
+            common.push_back("-fstack-protector-strong");
+            common.push_back("-funwind-tables");
+            common.push_back("-no-canonical-prefixes");
+
+            common.push_back("-D_FORTIFY_SOURCE=2");
+            common.push_back("-fpic");
+            common.push_back("-Wformat");
+            common.push_back("-Werror=format-security");
+            common.push_back("-fno-strict-aliasing");
+            common.push_back("-DNDEBUG");
+            common.push_back("-DANDROID");
+            common.push_back("-DPLATFORM_ANDROID");
+
+            if (abi.value == 0)
+            {
+                common.push_back("-march=armv7-a");
+                common.push_back("-mthumb");
+                common.push_back("-Oz");
+            }
+            else
+            {
+                common.push_back("-O2");
+            }
+
+            common.push_back("-I" + pathString(tc.sysroot / "usr" / "include" / abi.includeTriple));
+            common.push_back("-I" + pathString(tc.sysroot / "usr" / "include"));
+            common.push_back("-I" + pathString(baseRoot));
+
+            std::vector<std::string> cc;
+            std::vector<std::string> cpp;
+            cpp.push_back("-nostdinc++");
+            cpp.push_back("-I" + pathString(tc.cppInclude));
+            appendAll(cc, ccFlags);
+            appendAll(cpp, cppFlags);
+
+            const std::string ccCompiler = pathString(tc.clang);
+            const std::string cppCompiler = pathString(tc.clangxx);
+
+            // Sources are absolute, so a lexical relative path against the
+            // normalised base avoids canonicalising both paths per source.
+            const fs::path base = fs::absolute(baseRoot).lexically_normal();
+            fs::path lastObjDir;
+
             for (const auto &src : sources)
             {
                 const bool cppSource = isCppSource(src);
@@ -1073,37 +1128,38 @@ namespace crosside::build
                     result.hasCpp = true;
                 }
 
-                fs::path relParent;
-                try
-                {
-                    relParent = fs::relative(src.parent_path(), baseRoot);
-                }
-                catch (...)
+                fs::path relParent = fs::absolute(src.parent_path()).lexically_normal().lexically_relative(base);
+                if (relParent.empty())
                 {
                     relParent = src.parent_path().filename();
                 }
 
                 const fs::path objDir = objRoot / relParent;
-                if (!crosside::io::ensureDir(objDir))
+                if (objDir != lastObjDir)
                 {
-                    ctx.error("Failed create object subdir: ", objDir.string());
-                    return false;
+                    if (!crosside::io::ensureDir(objDir))
+                    {
+                        ctx.error("Failed create object subdir: ", objDir.string());
+                        return false;
+                    }
+                    lastObjDir = objDir;
                 }
 
                 const fs::path obj = objDir / (src.stem().string() + ".o");
 
-                if (!fullBuild && fs::exists(obj))
+                if (!fullBuild)
                 {
+                    // A missing object fails the stat, so no separate exists() probe.
                     std::error_code ec;
-                    const auto srcTime = fs::last_write_time(src, ec);
-                    if (ec)
-                    {
-                        ctx.warn("Failed to read source timestamp: ", src.string());
-                    }
-                    else
+                    const auto objTime = fs::last_write_time(obj, ec);
+                    if (!ec)
                     {
-                        const auto objTime = fs::last_write_time(obj, ec);
-                        if (!ec && objTime >= srcTime)
+                        const auto srcTime = fs::last_write_time(src, ec);
+                        if (ec)
+                        {
+                            ctx.warn("Failed to read source timestamp: ", src.string());
+                        }
+                        else if (objTime >= srcTime)
                         {
                             ctx.log("Skip ", src.string());
                             result.objects.push_back(obj);
@@ -1112,60 +1168,18 @@ namespace crosside::build
                     }
                 }
 
+                const auto &tail = cppSource ? cpp : cc;
                 std::vector<std::string> args;
-                args.push_back("-target");
-                args.push_back(abi.clangTarget);
-                args.push_back("--sysroot");
-                args.push_back(pathString(tc.sysroot));
-
-                args.push_back("-fdata-sections");
-                args.push_back("-ffunction-sections");
-                args.push_back("-fstack-protector-strong");
-                args.push_back("-funwind-tables");
-                args.push_back("-no-canonical-prefixes");
-
-                args.push_back("-D_FORTIFY_SOURCE=2");
-                args.push_back("-fpic");
-                args.push_back("-Wformat");
-                args.push_back("-Werror=format-security");
-                args.push_back("-fno-strict-aliasing");
-                args.push_back("-DNDEBUG");
-                args.push_back("-DANDROID");
-                args.push_back("-DPLATFORM_ANDROID");
-
-                if (abi.value == 0)
-                {
-                    args.push_back("-march=armv7-a");
-                    args.push_back("-mthumb");
-                    args.push_back("-Oz");
-                }
-                else
-                {
-                    args.push_back("-O2");
-                }
-
-                args.push_back("-I" + pathString(tc.sysroot / "usr" / "include" / abi.includeTriple));
-                args.push_back("-I" + pathString(tc.sysroot / "usr" / "include"));
-                args.push_back("-I" + pathString(baseRoot));
+                args.reserve(common.size() + tail.size() + 5);
+                args.insert(args.end(), common.begin(), common.end());
                 args.push_back("-I" + pathString(src.parent_path()));
-
-                if (cppSource)
-                {
-                    args.push_back("-nostdinc++");
-                    args.push_back("-I" + pathString(tc.cppInclude));
-                    appendAll(args, cppFlags);
-                }
-                else
-                {
-                    appendAll(args, ccFlags);
-                }
-
+                args.insert(args.end(), tail.begin(), tail.end());
                 args.push_back("-c");
                 args.push_back(pathString(src));
                 args.push_back("-o");
                 args.push_back(pathString(obj));
 
-                const std::string compiler = cppSource ? pathString(tc.clangxx) : pathString(tc.clang);
+                const std::string &compiler = cppSource ? cppCompiler : ccCompiler;
                 auto command = crosside::io::runCommand(compiler, args, {}, ctx, false);
                 if (command.code != 0)
                 {
@@ -1528,8 +1542,12 @@ namespace crosside::build
                 }
             }
 
-            value = std::regex_replace(value, std::regex("[^A-Za-z0-9_.]"), "");
-            value = std::regex_replace(value, std::regex("\\.+"), ".");
+            // Compiled once; std::regex construction dominates these small replacements.
+            static const std::regex invalidChars("[^A-Za-z0-9_.]");
+            static const std::regex repeatedDots("\\.+");
+            static const std::regex invalidTokenChars("[^A-Za-z0-9_]");
+            value = std::regex_replace(value, invalidChars, "");
+            value = std::regex_replace(value, repeatedDots, ".");
 
             while (!value.empty() && value.front() == '.')
             {
@@ -1548,7 +1566,7 @@ namespace crosside::build
                 {
                     if (!token.empty())
                     {
-                        token = std::regex_replace(token, std::regex("[^A-Za-z0-9_]"), "");
+                        token = std::regex_replace(token, invalidTokenChars, "");
                         if (!token.empty() && std::isdigit(static_cast<unsigned char>(token.front())) != 0)
                         {
                             token = "p" + token;
@@ -1779,7 +1797,7 @@ namespace crosside::build
             }
 
             const std::string content((std::istreambuf_iterator<char>(in)), std::istreambuf_iterator<char>());
-            const std::regex iconRegex(R"REGEX(android:icon="(@[^"]+)")REGEX");
+            static const std::regex iconRegex(R"REGEX(android:icon="(@[^"]+)")REGEX");
             std::smatch match;
             if (!std::regex_search(content, match, iconRegex))
             {
@@ -1823,7 +1841,7 @@ namespace crosside::build
             }
 
             const std::string content((std::istreambuf_iterator<char>(in)), std::istreambuf_iterator<char>());
-            const std::regex roundRegex(R"REGEX(android:roundIcon="(@[^"]+)")REGEX");
+            static const std::regex roundRegex(R"REGEX(android:roundIcon="(@[^"]+)")REGEX");
             std::smatch roundMatch;
             if (std::regex_search(content, roundMatch, roundRegex))
             {
@@ -1855,7 +1873,7 @@ namespace crosside::build
                 return;
             }
 
-            const std::regex appTagRegex(R"REGEX(<application\b[^>]*>)REGEX");
+            static const std::regex appTagRegex(R"REGEX(<application\b[^>]*>)REGEX");
             std::smatch appMatch;
             if (!std::regex_search(content, appMatch, appTagRegex))
             {
@@ -3,10 +3,13 @@
 #include <algorithm>
 #include <cctype>
 #include <filesystem>
+#include <fstream>
+#include <iterator>
 #include <optional>
 #include <string>
 #include <vector>
 
+#include "build/precompiled_header.hpp"
 #include "io/fs_utils.hpp"
 #include "io/process.hpp"
 #include "model/loader.hpp"
@@ -231,7 +234,7 @@ namespace crosside::build
             for (const auto &src : module.main.src)
             {
                 fs::path file = fs::absolute(module.dir / src);
-                if (!fs::exists(file) || !isCompilable(file))
+                if (!isCompilable(file) || !fs::exists(file))
                 {
                     continue;
                 }
@@ -240,7 +243,7 @@ namespace crosside::build
             for (const auto &src : block.src)
             {
                 fs::path file = fs::absolute(module.dir / src);
-                if (!fs::exists(file) || !isCompilable(file))
+                if (!isCompilable(file) || !fs::exists(file))
                 {
                     continue;
                 }
@@ -252,6 +255,135 @@ namespace crosside::build
             }
         }
 
+        bool writeFileIfChanged(const fs::path &path, const std::string &content)
+        {
+            {
+                std::ifstream in(path, std::ios::binary);
+                if (in)
+                {
+                    const std::string current((std::istreambuf_iterator<char>(in)), std::istreambuf_iterator<char>());
+                    if (current == content)
+                    {
+                        return true;
+                    }
+                }
+            }
+
+            std::ofstream out(path, std::ios::binary | std::ios::trunc);
+            if (!out)
+            {
+                return false;
+            }
+            out << content;
+            return static_cast<bool>(out);
+        }
+
+        // Per-language argument vector built once per compile pass; only the
+        // source and object slots are rewritten for each file.
+        constexpr std::size_t kSrcSlot = 1;
+        constexpr std::size_t kObjSlot = 3;
+
+        std::vector<std::string> compileArgsTemplate(const std::vector<std::string> &flags)
+        {
+            std::vector<std::string> args;
+            args.reserve(flags.size() + 5);
+            args.push_back("-c");
+            args.emplace_back();
+            args.push_back("-o");
+            args.emplace_back();
+            args.insert(args.end(), flags.begin(), flags.end());
+            args.push_back("-fPIC");
+            return args;
+        }
+
+        // Unity (jumbo) build: sources of the same language are grouped into
+        // batches of `batchSize`, each batch is a generated TU that #includes
+        // its members, and only those TUs are compiled. A batch is rebuilt when
+        // its object is older than the generated TU or any member source.
+        bool compileUnitySources(
+            const crosside::Context &ctx,
+            const fs::path &objRoot,
+            const std::vector<fs::path> &sources,
+            const std::vector<std::string> &ccArgs,
+            const std::vector<std::string> &cppArgs,
+            bool full,
+            std::size_t batchSize,
+            std::vector<fs::path> &objects)
+        {
+            std::vector<fs::path> cSources;
+            std::vector<fs::path> cppSources;
+            for (const auto &src : sources)
+            {
+                (isCppSource(src) ? cppSources : cSources).push_back(src);
+            }
+
+            const fs::path unityDir = objRoot / "_unity";
+            io::ensureDir(unityDir);
+
+            auto compileGroup = [&](const std::vector<fs::path> &group, bool cpp) -> bool
+            {
+                for (std::size_t begin = 0, index = 0; begin < group.size(); begin += batchSize, ++index)
+                {
+                    const std::size_t end = std::min(group.size(), begin + batchSize);
+                    const std::string stem = std::string(cpp ? "unity_cpp_" : "unity_c_") + std::to_string(index);
+                    const fs::path unitySrc = unityDir / (stem + (cpp ? ".cpp" : ".c"));
+                    const fs::path obj = unityDir / (stem + ".o");
+
+                    std::string content;
+                    for (std::size_t i = begin; i < end; ++i)
+                    {
+                        content += "#include \"" + fs::absolute(group[i]).generic_string() + "\"\n";
+                    }
+                    if (!writeFileIfChanged(unitySrc, content))
+                    {
+                        ctx.error("Failed write unity source: ", unitySrc.string());
+                        return false;
+                    }
+
+                    if (!full)
+                    {
+                        std::error_code ec;
+                        const auto objTime = fs::last_write_time(obj, ec);
+                        auto olderThanObj = [&](const fs::path &path)
+                        {
+                            std::error_code timeEc;
+                            const auto time = fs::last_write_time(path, timeEc);
+                            return !timeEc && time <= objTime;
+                        };
+
+                        bool upToDate = !ec && olderThanObj(unitySrc);
+                        for (std::size_t i = begin; upToDate && i < end; ++i)
+                        {
+                            upToDate = olderThanObj(group[i]);
+                        }
+                        if (upToDate)
+                        {
+                            ctx.log("Skip ", unitySrc.string());
+                            objects.push_back(obj);
+                            continue;
+                        }
+                    }
+
+                    ctx.log("Unity ", unitySrc.string(), " (", end - begin, " sources)");
+
+                    auto args = compileArgsTemplate(cpp ? cppArgs : ccArgs);
+                    args[kSrcSlot] = unitySrc.string();
+                    args[kObjSlot] = obj.string();
+
+                    auto result = io::runCommand(cpp ? "g++" : "gcc", args, {}, ctx, false);
+                    if (result.code != 0)
+                    {
+                        return false;
+                    }
+
+                    objects.push_back(obj);
+                }
+                return true;
+            };
+
+            return compileGroup(cSources, false) && compileGroup(cppSources, true);
+        }
+
         bool compileSources(
             const crosside::Context &ctx,
             const fs::path &baseRoot,
@@ -260,56 +392,70 @@ namespace crosside::build
             const std::vector<std::string> &ccArgs,
             const std::vector<std::string> &cppArgs,
             bool full,
+            int unityBatch,
             std::vector<fs::path> &objects)
         {
             objects.clear();
 
-            for (const auto &src : sources)
+            if (unityBatch > 1 && sources.size() > 1)
             {
-                fs::path relParent;
-                try
+                if (!compileUnitySources(ctx, objRoot, sources, ccArgs, cppArgs, full, static_cast<std::size_t>(unityBatch), objects))
                 {
-                    relParent = fs::relative(src.parent_path(), baseRoot);
+                    return false;
                 }
-                catch (...)
+                return !objects.empty();
+            }
+
+            // Sources are absolute, so a lexical relative path against the
+            // normalised base avoids canonicalising both paths per source.
+            const fs::path base = fs::absolute(baseRoot).lexically_normal();
+            fs::path lastObjDir;
+            const auto ccTemplate = compileArgsTemplate(ccArgs);
+            const auto cppTemplate = compileArgsTemplate(cppArgs);
+
+            for (const auto &src : sources)
+            {
+                fs::path relParent = fs::absolute(src.parent_path()).lexically_normal().lexically_relative(base);
+                if (relParent.empty())
                 {
                     relParent = src.parent_path().filename();
                 }
 
-                fs::path objDir = objRoot / relParent;
-                io::ensureDir(objDir);
+                const fs::path objDir = objRoot / relParent;
+                if (objDir != lastObjDir)
+                {
+                    io::ensureDir(objDir);
+                    lastObjDir = objDir;
+                }
                 fs::path obj = objDir / (src.stem().string() + ".o");
 
-                if (!full && fs::exists(obj))
+                if (!full)
                 {
+                    // A missing object fails the stat, so no separate exists() probe.
                     std::error_code ec;
-                    auto srcTime = fs::last_write_time(src, ec);
-                    if (ec)
+                    const auto objTime = fs::last_write_time(obj, ec);
+                    if (!ec)
                     {
-                        srcTime = fs::file_time_type::min();
-                    }
-                    auto objTime = fs::last_write_time(obj, ec);
-                    if (!ec && objTime >= srcTime)
-                    {
-                        ctx.log("Skip ", src.string());
-                        objects.push_back(obj);
-                        continue;
+                        auto srcTime = fs::last_write_time(src, ec);
+                        if (ec)
+                        {
+                            srcTime = fs::file_time_type::min();
+                        }
+                        if (objTime >= srcTime)
+                        {
+                            ctx.log("Skip ", src.string());
+                            objects.push_back(obj);
+                            continue;
+                        }
                     }
                 }
 
-                std::vector<std::string> args;
-                args.push_back("-c");
-                args.push_back(src.string());
-                args.push_back("-o");
-                args.push_back(obj.string());
-
                 const bool cpp = isCppSource(src);
-                const auto &flags = cpp ? cppArgs : ccArgs;
-                args.insert(args.end(), flags.begin(), flags.end());
-                args.push_back("-fPIC");
+                auto args = cpp ? cppTemplate : ccTemplate;
+                args[kSrcSlot] = src.string();
+                args[kObjSlot] = obj.string();
 
-                const std::string compiler = cpp ? "g++" : "gcc";
-                auto result = io::runCommand(compiler, args, {}, ctx, false);
+                auto result = io::runCommand(cpp ? "g++" : "gcc", args, {}, ctx, false);
                 if (result.code != 0)
                 {
                     return false;
@@ -404,7 +550,7 @@ namespace crosside::build
         io::ensureDir(objRoot);
 
         std::vector<fs::path> objects;
-        if (!compileSources(ctx, module.dir, objRoot, sources, cc, cpp, full, objects))
+        if (!compileSources(ctx, module.dir, objRoot, sources, cc, cpp, full, 0, objects))
         {
             return false;
         }
@@ -490,7 +636,7 @@ namespace crosside::build
         std::vector<fs::path> sources;
         for (const auto &src : project.src)
         {
-            if (fs::exists(src) && isCompilable(src))
+            if (isCompilable(src) && fs::exists(src))
             {
                 sources.push_back(src);
             }
@@ -584,8 +730,21 @@ namespace crosside::build
         const fs::path objRoot = project.root / "obj" / kDesktopFolder / buildCacheKey;
         io::ensureDir(objRoot);
 
+        if (!project.pchHeader.empty())
+        {
+            std::vector<std::string> pchFlags = cpp;
+            pchFlags.push_back("-fPIC");
+            const auto stub = preparePrecompiledHeader(ctx, "g++", project.pchHeader, objRoot / "_pch", pchFlags, ".gch", full);
+            if (!stub.has_value())
+            {
+                return false;
+            }
+            cpp.push_back("-include");
+            cpp.push_back(stub->string());
+        }
+
         std::vector<fs::path> objects;
-        if (!compileSources(ctx, project.root, objRoot, sources, cc, cpp, full, objects))
+        if (!compileSources(ctx, project.root, objRoot, sources, cc, cpp, full, project.desktopUnityBatch, objects))
         {
             return false;
         }
@@ -0,0 +1,195 @@
+#include "build/precompiled_header.hpp"
+
+#include <cctype>
+#include <fstream>
+#include <iterator>
+#include <string>
+#include <vector>
+
+#include "io/fs_utils.hpp"
+#include "io/process.hpp"
+
+namespace fs = std::filesystem;
+
+namespace crosside::build
+{
+    namespace
+    {
+
+        std::string readText(const fs::path &path)
+        {
+            std::ifstream in(path, std::ios::binary);
+            if (!in)
+            {
+                return {};
+            }
+            return std::string((std::istreambuf_iterator<char>(in)), std::istreambuf_iterator<char>());
+        }
+
+        bool writeText(const fs::path &path, const std::string &content)
+        {
+            std::ofstream out(path, std::ios::binary | std::ios::trunc);
+            if (!out)
+            {
+                return false;
+            }
+            out << content;
+            return static_cast<bool>(out);
+        }
+
+        bool pchUpToDate(const fs::path &output, const fs::path &depfile)
+        {
+            std::error_code ec;
+            const auto outTime = fs::last_write_time(output, ec);
+            if (ec)
+            {
+                return false;
+            }
+
+            const auto deps = readDepfile(depfile);
+            if (deps.empty())
+            {
+                return false;
+            }
+            for (const auto &dep : deps)
+            {
+                const auto depTime = fs::last_write_time(dep, ec);
+                if (ec || depTime > outTime)
+                {
+                    return false;
+                }
+            }
+            return true;
+        }
+
+    } // namespace
+
+    std::vector<fs::path> readDepfile(const fs::path &depfile)
+    {
+        const std::string text = readText(depfile);
+
+        std::vector<fs::path> deps;
+        std::string token;
+        bool seenTarget = false;
+        auto flush = [&]()
+        {
+            if (token.empty())
+            {
+                return;
+            }
+            if (!seenTarget)
+            {
+                seenTarget = token.back() == ':';
+            }
+            else if (token != ":")
+            {
+                deps.emplace_back(token);
+            }
+            token.clear();
+        };
+
+        for (std::size_t i = 0; i < text.size(); ++i)
+        {
+            const char ch = text[i];
+            if (ch == '\\' && i + 1 < text.size())
+            {
+                const char next = text[i + 1];
+                if (next == '\n' || next == '\r')
+                {
+                    flush();
+                    ++i;
+                    continue;
+                }
+                if (next == ' ' || next == '#')
+                {
+                    token.push_back(next);
+                    ++i;
+                    continue;
+                }
+            }
+            if (std::isspace(static_cast<unsigned char>(ch)) != 0)
+            {
+                flush();
+                continue;
+            }
+            token.push_back(ch);
+        }
+        flush();
+        return deps;
+    }
+
+    std::optional<fs::path> preparePrecompiledHeader(
+        const crosside::Context &ctx,
+        const std::string &compiler,
+        const fs::path &header,
+        const fs::path &pchRoot,
+        const std::vector<std::string> &flags,
+        const std::string &outputExt,
+        bool full)
+    {
+        std::error_code ec;
+        if (!fs::is_regular_file(header, ec))
+        {
+            ctx.error("Precompiled header not found: ", header.string());
+            return std::nullopt;
+        }
+
+        if (!io::ensureDir(pchRoot))
+        {
+            ctx.error("Failed create PCH directory: ", pchRoot.string());
+            return std::nullopt;
+        }
+
+        // Compilers only pick up `<name>.gch`/`<name>.pch` next to the header
+        // named by -include, so compile a stub that includes the real header.
+        // If the PCH is rejected the stub still works as a plain header.
+        const fs::path stub = pchRoot / header.filename();
+        const fs::path output = stub.string() + outputExt;
+        const fs::path depfile = output.string() + ".d";
+        const fs::path stamp = output.string() + ".flags";
+
+        const std::string stubText = "#include \"" + fs::absolute(header).generic_string() + "\"\n";
+        if (readText(stub) != stubText && !writeText(stub, stubText))
+        {
+            ctx.error("Failed write PCH stub: ", stub.string());
+            return std::nullopt;
+        }
+
+        std::string key = compiler;
+        for (const auto &flag : flags)
+        {
+            key += '\n';
+            key += flag;
+        }
+
+        if (!full && readText(stamp) == key && pchUpToDate(output, depfile))
+        {
+            ctx.log("Skip PCH ", output.string());
+            return stub;
+        }
+
+        std::vector<std::string> args;
+        args.push_back("-x");
+        args.push_back("c++-header");
+        args.push_back(stub.string());
+        args.push_back("-o");
+        args.push_back(output.string());
+        args.push_back("-MD");
+        args.push_back("-MF");
+        args.push_back(depfile.string());
+        args.insert(args.end(), flags.begin(), flags.end());
+
+        auto result = io::runCommand(compiler, args, {}, ctx, false);
+        if (result.code != 0)
+        {
+            ctx.warn("PCH build failed, compiling without it: ", header.string());
+            fs::remove(output, ec);
+            fs::remove(stamp, ec);
+            return stub;
+        }
+
+        writeText(stamp, key);
+        return stub;
+    }
+
+} // namespace crosside::build
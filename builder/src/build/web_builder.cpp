@@ -9,6 +9,7 @@
 #include <string>
 #include <vector>
 
+#include "build/precompiled_header.hpp"
 #include "io/fs_utils.hpp"
 #include "io/http_server.hpp"
 #include "io/json_reader.hpp"
@@ -287,7 +288,7 @@ std::vector<fs::path> collectModuleSourcesWeb(const crosside::model::ModuleSpec
             return;
         }
         const fs::path path = fs::absolute(module.dir / rel);
-        if (!fs::exists(path) || !isCompilable(path)) {
+        if (!isCompilable(path) || !fs::exists(path)) {
             return;
         }
         const std::string key = pathString(path);
@@ -315,7 +316,7 @@ std::vector<fs::path> collectProjectSourcesWeb(const crosside::model::ProjectSpe
     std::set<std::string> seen;
 
     for (const auto &src : project.src) {
-        if (!fs::exists(src) || !isCompilable(src)) {
+        if (!isCompilable(src) || !fs::exists(src)) {
             continue;
         }
         const fs::path full = fs::absolute(src);
@@ -467,32 +468,50 @@ bool compileWebSources(
         return false;
     }
 
+    // Build each language's argument vector once (dropping empty flags); per
+    // source only the input and output slots are filled in.
+    constexpr std::size_t srcSlot = 1;
+    constexpr std::size_t objSlot = 3;
+    std::vector<std::string> cc{"-c", "", "-o", ""};
+    std::vector<std::string> cpp{"-c", "", "-o", ""};
+    appendAll(cc, ccFlags);
+    appendAll(cpp, cppFlags);
+    const std::string ccCompiler = pathString(tc.emcc);
+    const std::string cppCompiler = pathString(tc.emcpp);
+
+    // Sources are absolute, so a lexical relative path against the normalised
+    // base avoids canonicalising both paths per source.
+    const fs::path base = fs::absolute(baseRoot).lexically_normal();
+    fs::path lastObjDir;
+
     for (const auto &src : sources) {
         const bool cppSource = isCppSource(src);
         if (cppSource) {
             result.hasCpp = true;
         }
 
-        fs::path relParent;
-        try {
-            relParent = fs::relative(src.parent_path(), baseRoot);
-        } catch (...) {
+        fs::path relParent = fs::absolute(src.parent_path()).lexically_normal().lexically_relative(base);
+        if (relParent.empty()) {
             relParent = src.parent_path().filename();
         }
 
         const fs::path objDir = objRoot / relParent;
-        if (!crosside::io::ensureDir(objDir)) {
-            ctx.error("Failed create object subdir: ", objDir.string());
-            return false;
+        if (objDir != lastObjDir) {
+            if (!crosside::io::ensureDir(objDir)) {
+                ctx.error("Failed create object subdir: ", objDir.string());
+                return false;
+            }
+            lastObjDir = objDir;
         }
 
         const fs::path obj = objDir / (src.stem().string() + ".o");
 
-        if (!fullBuild && fs::exists(obj)) {
+        if (!fullBuild) {
+            // A missing object fails the stat, so no separate exists() probe.
             std::error_code ec;
-            const auto srcTime = fs::last_write_time(src, ec);
+            const auto objTime = fs::last_write_time(obj, ec);
             if (!ec) {
-                const auto objTime = fs::last_write_time(obj, ec);
+                const auto srcTime = fs::last_write_time(src, ec);
                 if (!ec && objTime >= srcTime) {
                     ctx.log("Skip ", src.string());
                     result.objects.push_back(obj);
@@ -501,20 +520,11 @@ bool compileWebSources(
             }
         }
 
-        std::vector<std::string> args;
-        args.push_back("-c");
-        args.push_back(pathString(src));
-        args.push_back("-o");
-        args.push_back(pathString(obj));
+        auto args = cppSource ? cpp : cc;
+        args[srcSlot] = pathString(src);
+        args[objSlot] = pathString(obj);
 
-        if (cppSource) {
-            appendAll(args, cppFlags);
-        } else {
-            appendAll(args, ccFlags);
-        }
-
-        const std::string compiler = cppSource ? pathString(tc.emcpp) : pathString(tc.emcc);
-        auto command = crosside::io::runCommand(compiler, args, {}, ctx, false);
+        auto command = crosside::io::runCommand(cppSource ? cppCompiler : ccCompiler, args, {}, ctx, false);
         if (command.code != 0) {
             ctx.error("Compile failed for ", src.string());
             return false;
@@ -956,6 +966,18 @@ bool buildProjectWeb(
 
     const std::string buildCacheKey = crosside::model::projectBuildCacheKey(project);
     const fs::path objRoot = project.root / "obj" / "Web" / buildCacheKey;
+
+    if (!project.pchHeader.empty()) {
+        std::vector<std::string> pchFlags;
+        appendAll(pchFlags, cppFlags);
+        const auto stub = preparePrecompiledHeader(ctx, pathString(tc.emcpp), project.pchHeader, objRoot / "_pch", pchFlags, ".pch", fullBuild);
+        if (!stub.has_value()) {
+            return false;
+        }
+        cppFlags.push_back("-include");
+        cppFlags.push_back(pathString(stub.value()));
+    }
+
     CompileResult compiled;
     if (!compileWebSources(ctx, tc, project.root, objRoot, sources, ccFlags, cppFlags, fullBuild, compiled)) {
         return false;
@@ -3,6 +3,7 @@
 #include <filesystem>
 #include <sstream>
 #include <string>
+#include <utility>
 #include <vector>
 
 #ifdef _WIN32
@@ -12,8 +13,11 @@
 #include <cerrno>
 #include <cstring>
 #include <fcntl.h>
+#include <spawn.h>
 #include <sys/wait.h>
 #include <unistd.h>
+
+extern char **environ;
 #endif
 
 namespace crosside::io {
@@ -63,15 +67,11 @@ bool utf8ToWide(const std::string &input, std::wstring &out) {
 }
 
 ProcessResult runCommandWindows(
-    const std::string &command,
-    const std::vector<std::string> &args,
+    ProcessResult result,
     const std::filesystem::path &cwd,
     const crosside::Context &ctx,
     bool detached
 ) {
-    ProcessResult result;
-    result.commandLine = buildDisplayCommand(command, args);
-
     std::wstring wideCmdLine;
     if (!utf8ToWide(result.commandLine, wideCmdLine)) {
         result.code = -1;
@@ -156,15 +156,13 @@ std::vector<char *> makeArgv(std::vector<std::string> &storage) {
 }
 
 ProcessResult runCommandPosix(
+    ProcessResult result,
     const std::string &command,
     const std::vector<std::string> &args,
     const std::filesystem::path &cwd,
     const crosside::Context &ctx,
     bool detached
 ) {
-    ProcessResult result;
-    result.commandLine = buildDisplayCommand(command, args);
-
     std::vector<std::string> storage;
     storage.reserve(args.size() + 1);
     storage.push_back(command);
@@ -172,19 +170,31 @@ ProcessResult runCommandPosix(
     std::vector<char *> argv = makeArgv(storage);
 
     if (!detached) {
-        const pid_t pid = fork();
-        if (pid < 0) {
-            result.code = -1;
-            ctx.error("Failed to fork process: ", std::strerror(errno));
-            return result;
-        }
+        pid_t pid = -1;
+        if (cwd.empty()) {
+            // Compiler/linker calls run in the current directory; posix_spawnp
+            // avoids duplicating the builder's address space for every child.
+            const int rc = posix_spawnp(&pid, command.c_str(), nullptr, nullptr, argv.data(), environ);
+            if (rc != 0) {
+                // Same exit code the fork path reports when execvp fails.
+                result.code = 127;
+                return result;
+            }
+        } else {
+            pid = fork();
+            if (pid < 0) {
+                result.code = -1;
+                ctx.error("Failed to fork process: ", std::strerror(errno));
+                return result;
+            }
 
-        if (pid == 0) {
-            if (!cwd.empty() && chdir(cwd.c_str()) != 0) {
+            if (pid == 0) {
+                if (chdir(cwd.c_str()) != 0) {
+                    _exit(127);
+                }
+                execvp(command.c_str(), argv.data());
                 _exit(127);
             }
-            execvp(command.c_str(), argv.data());
-            _exit(127);
         }
 
         result.processId = static_cast<long long>(pid);
@@ -291,10 +301,12 @@ ProcessResult runCommandInternal(
         return result;
     }
 
+    // The display string is built once above; the Windows path reuses it as the
+    // actual command line, POSIX only keeps it for the result.
 #ifdef _WIN32
-    return runCommandWindows(command, args, cwd, ctx, detached);
+    return runCommandWindows(std::move(result), cwd, ctx, detached);
 #else
-    return runCommandPosix(command, args, cwd, ctx, detached);
+    return runCommandPosix(std::move(result), command, args, cwd, ctx, detached);
 #endif
 }
 
@@ -531,6 +531,16 @@ namespace crosside::model
                 project.include.push_back(toAbsolute(project.root, item));
             }
 
+            std::string pchHeader = data.value("Pch", "");
+            if (pchHeader.empty())
+            {
+                pchHeader = data.value("PCH", "");
+            }
+            if (!pchHeader.empty())
+            {
+                project.pchHeader = toAbsolute(project.root, pchHeader);
+            }
+
             project.main = parseBuildArgs(data.value("Main", json::object()));
             project.desktop = parseBuildArgs(data.value("Desktop", json::object()));
             project.android = parseBuildArgs(data.value("Android", json::object()));
@@ -721,6 +731,11 @@ namespace crosside::model
                 {
                     project.desktopContentRoot = toAbsolute(project.root, contentRoot);
                 }
+
+                if (desktop.contains("UNITY_BATCH") && desktop["UNITY_BATCH"].is_number_integer())
+                {
+                    project.desktopUnityBatch = std::max(0, desktop["UNITY_BATCH"].get<int>());
+                }
             }
             if (data.contains("Web") && data["Web"].is_object())
             {
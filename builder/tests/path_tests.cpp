@@ -226,3 +226,27 @@ TEST(PathResolve, LoadModuleFileSupportsPlatformStaticOverrides)
 
     cleanupTemp(repoRoot);
 }
+
+TEST(PathResolve, LoadProjectFileReadsDesktopUnityBatch)
+{
+    const fs::path projectRoot = makeTempRepoRoot("project_unity_batch");
+    cleanupTemp(projectRoot);
+    fs::create_directories(projectRoot);
+
+    const fs::path projectFile = projectRoot / "main.mk";
+    {
+        std::ofstream out(projectFile);
+        out << R"({
+  "Name": "unity",
+  "Src": [],
+  "Desktop": { "UNITY_BATCH": 16 }
+}
+)";
+    }
+
+    const auto spec = crosside::model::loadProjectFile(projectFile, makeContext());
+    ASSERT_TRUE(spec.has_value());
+    EXPECT_EQ(spec->desktopUnityBatch, 16);
+
+    cleanupTemp(projectRoot);
+}
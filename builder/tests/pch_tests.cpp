@@ -0,0 +1,88 @@
+#include <chrono>
+#include <filesystem>
+#include <fstream>
+#include <string>
+
+#include <gtest/gtest.h>
+
+#include "build/precompiled_header.hpp"
+#include "core/context.hpp"
+
+namespace fs = std::filesystem;
+
+namespace
+{
+
+    crosside::Context makeContext()
+    {
+        return crosside::Context(false);
+    }
+
+    fs::path makeTempRoot(const std::string &name)
+    {
+        const auto now = std::chrono::steady_clock::now().time_since_epoch().count();
+        return fs::temp_directory_path() / ("builder_pch_test_" + name + "_" + std::to_string(now));
+    }
+
+} // namespace
+
+TEST(PrecompiledHeader, ReadDepfileHandlesContinuationsAndEscapedSpaces)
+{
+    const fs::path root = makeTempRoot("depfile");
+    fs::create_directories(root);
+    const fs::path depfile = root / "pch.h.gch.d";
+    {
+        std::ofstream out(depfile);
+        out << "/tmp/out/pch.h.gch: /tmp/out/pch.h \\\n"
+            << "  /tmp/src/my\\ header.h /usr/include/vector\n";
+    }
+
+    const auto deps = crosside::build::readDepfile(depfile);
+    ASSERT_EQ(deps.size(), 3u);
+    EXPECT_EQ(deps[0], fs::path("/tmp/out/pch.h"));
+    EXPECT_EQ(deps[1], fs::path("/tmp/src/my header.h"));
+    EXPECT_EQ(deps[2], fs::path("/usr/include/vector"));
+
+    std::error_code ec;
+    fs::remove_all(root, ec);
+}
+
+TEST(PrecompiledHeader, BuildsOnceAndReusesUpToDateOutput)
+{
+#ifdef _WIN32
+    GTEST_SKIP() << "Uses the host g++ toolchain.";
+#else
+    const fs::path root = makeTempRoot("build");
+    fs::create_directories(root / "src");
+    const fs::path header = root / "src" / "pch.hpp";
+    {
+        std::ofstream out(header);
+        out << "#pragma once\n#include <string>\n";
+    }
+
+    auto ctx = makeContext();
+    const fs::path pchRoot = root / "obj" / "_pch";
+    const auto stub = crosside::build::preparePrecompiledHeader(ctx, "g++", header, pchRoot, {"-std=c++17"}, ".gch", false);
+    ASSERT_TRUE(stub.has_value());
+    EXPECT_EQ(stub.value(), pchRoot / "pch.hpp");
+
+    const fs::path gch = pchRoot / "pch.hpp.gch";
+    ASSERT_TRUE(fs::exists(gch));
+    const auto firstTime = fs::last_write_time(gch);
+
+    const auto again = crosside::build::preparePrecompiledHeader(ctx, "g++", header, pchRoot, {"-std=c++17"}, ".gch", false);
+    ASSERT_TRUE(again.has_value());
+    EXPECT_EQ(fs::last_write_time(gch), firstTime);
+
+    std::error_code ec;
+    fs::remove_all(root, ec);
+#endif
+}
+
+TEST(PrecompiledHeader, MissingHeaderFails)
+{
+    auto ctx = makeContext();
+    const fs::path root = makeTempRoot("missing");
+    const auto stub = crosside::build::preparePrecompiledHeader(ctx, "g++", root / "nope.hpp", root / "_pch", {}, ".gch", false);
+    EXPECT_FALSE(stub.has_value());
+}
@@ -1,5 +1,5 @@
 from pyray import *
-import random
+import numpy as np
 
 # --------------------
 # Configurações
@@ -7,33 +7,63 @@ import random
 WIDTH = 800
 HEIGHT = 450
 GRAVITY = 0.5
+SPAWN = 500
 
 # --------------------
-# Sprite
+# Sprites (Structure-of-Arrays)
 # --------------------
-class Sprite:
-    def __init__(self, x, y):
-        self.x = float(x)
-        self.y = float(y)
-        self.vx = (random.randint(0, 199) - 100) / 10.0
-        self.vy = (random.randint(0, 199) - 100) / 10.0
-
-    def move(self, tex):
-        self.x += self.vx
-        self.y += self.vy
-
-        self.vy += GRAVITY
-
-        # chão
-        if self.y > 400:
-            self.y = 400
-            self.vy *= -0.85
-
-        # paredes
-        if self.x < 0 or self.x > 800:
-            self.vx *= -1.0
-
-        draw_texture(tex, int(self.x), int(self.y), WHITE)
+# Em vez de um objeto Sprite por coelho, guardamos x/y/vx/vy em arrays
+# float32 contíguos e fazemos a física com operações vetoriais do NumPy.
+cap = 4096
+xs = np.zeros(cap, np.float32)
+ys = np.zeros(cap, np.float32)
+vxs = np.zeros(cap, np.float32)
+vys = np.zeros(cap, np.float32)
+n = 0
+
+# Um único gerador: as velocidades de cada spawn saem numa só chamada.
+rng = np.random.default_rng()
+
+def reserve(count):
+    global cap, xs, ys, vxs, vys
+    if count <= cap:
+        return
+    while cap < count:
+        cap *= 2
+    xs = np.resize(xs, cap)
+    ys = np.resize(ys, cap)
+    vxs = np.resize(vxs, cap)
+    vys = np.resize(vys, cap)
+
+def spawn(x, y, count):
+    global n
+    reserve(n + count)
+    end = n + count
+    xs[n:end] = x
+    ys[n:end] = y
+    vel = (rng.integers(0, 200, (2, count)) - 100) / 10.0
+    vxs[n:end] = vel[0]
+    vys[n:end] = vel[1]
+    n = end
+
+def move():
+    x = xs[:n]
+    y = ys[:n]
+    vx = vxs[:n]
+    vy = vys[:n]
+
+    x += vx
+    y += vy
+
+    vy += GRAVITY
+
+    # chão
+    chao = y > 400
+    y[chao] = 400
+    vy[chao] *= -0.85
+
+    # paredes
+    vx[(x < 0) | (x > 800)] *= -1.0
 
 # --------------------
 # Init
@@ -48,11 +78,8 @@ RED = Color(255, 0, 0, 255)
 
 tex = load_texture("assets/wabbit_alpha.png")
 
-lista = []
-
 # cria sprites iniciais 
-#for i in range(30000):
-#    lista.append(Sprite(get_mouse_x(), get_mouse_y()))
+#spawn(get_mouse_x(), get_mouse_y(), 30000)
 
 # --------------------
 # Loop principal
@@ -61,8 +88,7 @@ while not window_should_close():
 
     # adicionar sprites com o rato
     if is_mouse_button_down(MOUSE_LEFT_BUTTON):
-        for i in range(500):
-            lista.append(Sprite(get_mouse_x(), get_mouse_y()))
+        spawn(get_mouse_x(), get_mouse_y(), SPAWN)
 
     begin_drawing()
     clear_background(BLACK)
@@ -70,10 +96,11 @@ while not window_should_close():
     draw_texture(tex, get_mouse_x(), get_mouse_y(), WHITE)
 
     # update + draw
-    for sprite in lista:
-        sprite.move(tex)
+    move()
+    for px, py in zip(xs[:n].astype(np.int32).tolist(), ys[:n].astype(np.int32).tolist()):
+        draw_texture(tex, px, py, WHITE)
 
-    draw_text(f"count {len(lista)}", 10, 30, 20, LIGHTGRAY)
+    draw_text(f"count {n}", 10, 30, 20, LIGHTGRAY)
     draw_fps(10, 10)
 
     end_drawing()
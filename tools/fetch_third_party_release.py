@@ -6,18 +6,39 @@ Fetch third-party source archives from upstream releases/tags without git clone.
 from __future__ import annotations
 
 import argparse
+import base64
+import concurrent.futures
+import contextlib
 import datetime
+import hashlib
+import http.client
+import io
 import json
 import os
 import re
 import shutil
+import ssl
+import subprocess
 import tarfile
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
 import zipfile
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Callable, Iterator
+
+try:  # Optional: libarchive-c extracts in C, several times faster than tarfile/zipfile.
+    import libarchive
+    import libarchive.extract
+except ImportError:
+    libarchive = None
+
+try:  # Optional: orjson parses manifest and API payloads several times faster than json.
+    import orjson
+except ImportError:
+    orjson = None
 
 
 SCRIPT_DIR = Path(__file__).resolve().parent
@@ -26,11 +47,37 @@ DEFAULT_MANIFEST = SCRIPT_DIR / "third_party_releases.json"
 DEFAULT_OUTPUT_DIR = Path("third_party_src")
 DEFAULT_BACKUP_DIR = Path("third_party_backup")
 DEFAULT_TIMEOUT_SECONDS = 30
+DEFAULT_JOBS = 8
+MAX_REDIRECTS = 5
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+DEFAULT_RATE_PER_SECOND = 10.0
+DEFAULT_MAX_PARALLEL_REQUESTS = 8
+MAX_RETRIES = 5
+MAX_RETRY_WAIT_SECONDS = 60
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 50
+
+NAME_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+PRERELEASE_TAG_RE = re.compile(r"(alpha|beta|rc|preview|pre)", re.IGNORECASE)
+VERSION_TAG_RE = re.compile(r"(?i)^(v?\d+(?:\.\d+)*|ver-\d+(?:-\d+)*)$")
+COPY_CHUNK_SIZE = 1024 * 1024
 USER_AGENT = "crosside-third-party-fetch/1.0"
+DEFAULT_CACHE_FILE = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "crosside" / "gh_releases.json"
+)
+DEFAULT_CACHE_TTL_SECONDS = 10 * 60
+CACHE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+UPSTREAM_STAMP_NAME = ".upstream.json"
+
+
+def json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def load_manifest(path: Path) -> dict[str, Any]:
-    data = json.loads(path.read_text(encoding="utf-8"))
+    data = json_loads(path.read_bytes())
     if not isinstance(data, dict) or "libraries" not in data:
         raise ValueError(f"Invalid manifest structure: {path}")
     libraries = data["libraries"]
@@ -58,7 +105,7 @@ def select_libraries(manifest: dict[str, Any], names: list[str]) -> dict[str, di
 
 
 def normalize_name(raw: str) -> str:
-    return re.sub(r"[^A-Za-z0-9._-]+", "-", raw).strip("-")
+    return NAME_UNSAFE_RE.sub("-", raw).strip("-")
 
 
 def now_stamp() -> str:
@@ -76,15 +123,59 @@ def unique_in_order(values: list[str]) -> list[str]:
     return out
 
 
+def fast_copy_file(src: str, dst: str) -> str:
+    """shutil.copy2 that lets the kernel move the bytes with copy_file_range when it can
+    (which also reflinks on Btrfs/XFS); otherwise copy2's own sendfile/fcopyfile paths."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return dst
+        except OSError:
+            pass  # Cross-device or unsupported filesystem: copy2 below rewrites dst.
+    return shutil.copy2(src, dst)
+
+
 def copy_path(src: Path, dst: Path) -> None:
     if src.is_dir():
         if dst.exists() and dst.is_file():
             dst.unlink()
         dst.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copytree(src, dst, dirs_exist_ok=True)
+        shutil.copytree(src, dst, dirs_exist_ok=True, copy_function=fast_copy_file)
         return
     dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dst)
+    fast_copy_file(str(src), str(dst))
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as src:
+        for block in iter(lambda: src.read(COPY_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_upstream_stamp(module_dir: Path) -> dict[str, Any]:
+    try:
+        data = json_loads((module_dir / UPSTREAM_STAMP_NAME).read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_upstream_stamp(module_dir: Path, stamp: dict[str, Any]) -> None:
+    (module_dir / UPSTREAM_STAMP_NAME).write_text(json.dumps(stamp, indent=2) + "\n", encoding="utf-8")
+
+
+def clear_upstream_stamp(module_dir: Path) -> None:
+    (module_dir / UPSTREAM_STAMP_NAME).unlink(missing_ok=True)
 
 
 def remove_path(path: Path) -> None:
@@ -106,9 +197,17 @@ def backup_then_remove(target: Path, backup_target: Path | None) -> None:
 
 
 def detect_extracted_source_root(extract_dir: Path) -> Path:
-    entries = [p for p in extract_dir.iterdir() if p.name != "__MACOSX"]
-    if len(entries) == 1 and entries[0].is_dir():
-        return entries[0]
+    # Stop at the second entry: only a single top-level directory is unwrapped.
+    only: os.DirEntry[str] | None = None
+    with os.scandir(extract_dir) as it:
+        for entry in it:
+            if entry.name == "__MACOSX":
+                continue
+            if only is not None:
+                return extract_dir
+            only = entry
+    if only is not None and only.is_dir():
+        return Path(only.path)
     return extract_dir
 
 
@@ -142,6 +241,28 @@ def describe_error(exc: Exception) -> str:
     return str(exc)
 
 
+def run_library_jobs(
+    libs: dict[str, dict[str, Any]],
+    worker: Callable[[str, dict[str, Any]], tuple[bool, list[str]]],
+    jobs: int,
+) -> int:
+    """Run `worker` for each library on a thread pool and print its lines as each one finishes."""
+    if not libs:
+        return 0
+    exit_code = 0
+    max_workers = max(1, min(jobs, len(libs)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(worker, name, info) for name, info in libs.items()]
+        # Only this thread prints, so each library's lines stay together.
+        for future in concurrent.futures.as_completed(futures):
+            ok, lines = future.result()
+            for line in lines:
+                print(line)
+            if not ok:
+                exit_code = 1
+    return exit_code
+
+
 def headers_with_optional_token(token: str | None) -> dict[str, str]:
     headers = {"User-Agent": USER_AGENT, "Accept": "application/vnd.github+json"}
     if token:
@@ -149,118 +270,708 @@ def headers_with_optional_token(token: str | None) -> dict[str, str]:
     return headers
 
 
-def http_get_json(url: str, token: str | None) -> Any:
-    req = urllib.request.Request(url, headers=headers_with_optional_token(token))
-    with urllib.request.urlopen(req, timeout=DEFAULT_TIMEOUT_SECONDS) as response:
-        return json.loads(response.read().decode("utf-8"))
+def proxy_for(scheme: str, host: str) -> urllib.parse.SplitResult | None:
+    """The HTTP(S)_PROXY entry for `scheme` unless NO_PROXY exempts `host`, as urlopen() picks it."""
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    return urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+
+def proxy_auth_headers(proxy: urllib.parse.SplitResult) -> dict[str, str]:
+    if proxy.username is None:
+        return {}
+    credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+    return {"Proxy-Authorization": "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")}
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host), shared by all worker threads.
+
+    Hosts that the environment routes through a proxy get connections to that proxy: HTTPS is
+    tunnelled with CONNECT, plain HTTP is forwarded (see send_request).
+    """
+
+    def __init__(self, max_idle_per_host: int = 16) -> None:
+        self._max_idle = max_idle_per_host
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self._routes: dict[tuple[str, str], urllib.parse.SplitResult | None] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def route(self, scheme: str, host: str) -> urllib.parse.SplitResult | None:
+        """Proxy used for (scheme, host), resolved once per run so pooled connections agree."""
+        with self._lock:
+            if (scheme, host) not in self._routes:
+                self._routes[(scheme, host)] = proxy_for(scheme, host)
+            return self._routes[(scheme, host)]
+
+    def acquire(self, scheme: str, host: str, reuse: bool = True) -> tuple[http.client.HTTPConnection, bool]:
+        if reuse:
+            with self._lock:
+                idle = self._idle.get((scheme, host))
+                if idle:
+                    return idle.pop(), True
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {scheme}")
+        proxy = self.route(scheme, host)
+        connect_host, connect_port = (proxy.hostname, proxy.port or 80) if proxy else (host, None)
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(
+                connect_host, connect_port, timeout=DEFAULT_TIMEOUT_SECONDS, context=self._ssl_context
+            )
+            if proxy:
+                conn.set_tunnel(host, headers=proxy_auth_headers(proxy))
+        else:
+            conn = http.client.HTTPConnection(connect_host, connect_port, timeout=DEFAULT_TIMEOUT_SECONDS)
+        return conn, False
+
+    def release(self, scheme: str, host: str, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host), [])
+            if len(idle) < self._max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+
+HTTP_POOL = ConnectionPool()
+
+
+def send_request(
+    scheme: str, host: str, method: str, target: str, headers: dict[str, str], body: bytes | None = None
+) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+    proxy = HTTP_POOL.route(scheme, host)
+    if proxy and scheme == "http":
+        # A forwarding proxy takes the absolute URL and its credentials on every request.
+        target = f"http://{host}{target}"
+        headers = {**headers, **proxy_auth_headers(proxy)}
+    conn, reused = HTTP_POOL.acquire(scheme, host)
+    try:
+        conn.request(method, target, body=body, headers=headers)
+        return conn, conn.getresponse()
+    except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+        conn.close()
+        if not reused:
+            raise
+    except BaseException:
+        conn.close()
+        raise
+    # The server dropped an idle keep-alive connection; retry once on a new one.
+    conn, _ = HTTP_POOL.acquire(scheme, host, reuse=False)
+    try:
+        conn.request(method, target, body=body, headers=headers)
+        return conn, conn.getresponse()
+    except BaseException:
+        conn.close()
+        raise
+
+
+def finish_response(scheme: str, host: str, conn: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+    # Only a fully read keep-alive response leaves the connection reusable.
+    if response.isclosed() and not response.will_close:
+        HTTP_POOL.release(scheme, host, conn)
+    else:
+        conn.close()
+
+
+class RateLimiter:
+    """Caps concurrent HTTP requests and spaces their starts to at most `rate` per second."""
+
+    def __init__(self, rate: float, max_parallel: int) -> None:
+        self.configure(rate, max_parallel)
+
+    def configure(self, rate: float, max_parallel: int) -> None:
+        self._slots = threading.Semaphore(max(1, max_parallel))
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def __enter__(self) -> RateLimiter:
+        self._slots.acquire()
+        if self._interval:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self._interval
+            if start > now:
+                time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._slots.release()
+
+
+HTTP_LIMITER = RateLimiter(DEFAULT_RATE_PER_SECOND, DEFAULT_MAX_PARALLEL_REQUESTS)
+
+
+def retry_delay(exc: urllib.error.HTTPError, attempt: int) -> float | None:
+    """Seconds to wait before retrying a rate-limited request, or None if it should fail now."""
+    if exc.code not in (403, 429):
+        return None
+    retry_after = exc.headers.get("Retry-After", "")
+    reset = exc.headers.get("X-RateLimit-Reset", "")
+    if retry_after.isdigit():
+        delay = float(retry_after)
+    elif exc.headers.get("X-RateLimit-Remaining") == "0" and reset.isdigit():
+        delay = float(reset) - time.time() + 1
+    elif exc.code == 429:
+        delay = 2.0**attempt
+    else:
+        return None  # A plain 403 is a permission problem, not throttling.
+    if delay > MAX_RETRY_WAIT_SECONDS:
+        return None
+    return max(delay, 1.0)
+
+
+def open_response(
+    url: str, headers: dict[str, str], method: str, body: bytes | None = None
+) -> tuple[str, str, http.client.HTTPConnection, http.client.HTTPResponse]:
+    """Send a request through HTTP_POOL, following redirects; 4xx/5xx raise urllib.error.HTTPError."""
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        conn, response = send_request(parts.scheme, parts.netloc, method, target, headers, body)
+
+        location = response.getheader("Location")
+        if response.status in REDIRECT_CODES and location:
+            response.read()
+            finish_response(parts.scheme, parts.netloc, conn, response)
+            next_url = urllib.parse.urljoin(url, location)
+            if urllib.parse.urlsplit(next_url).netloc != parts.netloc:
+                headers = {k: v for k, v in headers.items() if k.lower() != "authorization"}
+            url = next_url
+            continue
+
+        if response.status >= 400:
+            body = response.read()
+            finish_response(parts.scheme, parts.netloc, conn, response)
+            raise urllib.error.HTTPError(url, response.status, response.reason, response.msg, io.BytesIO(body))
+
+        return parts.scheme, parts.netloc, conn, response
+
+    raise urllib.error.URLError(f"Too many redirects: {url}")
+
+
+@contextlib.contextmanager
+def http_open(
+    url: str, headers: dict[str, str], method: str = "GET", body: bytes | None = None
+) -> Iterator[http.client.HTTPResponse]:
+    """Rate-limited request that retries while GitHub reports throttling."""
+    with HTTP_LIMITER:
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                scheme, host, conn, response = open_response(url, headers, method, body)
+                break
+            except urllib.error.HTTPError as exc:
+                delay = retry_delay(exc, attempt) if attempt < MAX_RETRIES else None
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+        try:
+            yield response
+        except BaseException:
+            conn.close()
+            raise
+        finish_response(scheme, host, conn, response)
+
+
+def http_get_json(
+    url: str,
+    token: str | None,
+    cache: ReleaseCache | None = None,
+    keep: Callable[[Any], Any] = lambda data: data,
+) -> Any:
+    """GET a JSON document and return `keep(document)`.
+
+    With a cache, only that reduced value is stored next to the ETag, and the stored copy is
+    revalidated via If-None-Match.
+    """
+    headers = headers_with_optional_token(token)
+    cache_key = f"etag|{url}"
+    cached = cache.peek(cache_key) if cache else None
+    if cached and cached.get("etag") and "kept" in cached:
+        headers["If-None-Match"] = cached["etag"]
+    else:
+        cached = None
+
+    with http_open(url, headers) as response:
+        body = response.read()
+        if response.status == 304 and cached:
+            return cached["kept"]
+        kept = keep(json_loads(body))
+        etag = response.getheader("ETag")
+
+    if cache and etag:
+        cache.put(cache_key, {"etag": etag, "kept": kept})
+    return kept
 
 
 def is_prerelease_tag(tag: str) -> bool:
-    return bool(re.search(r"(alpha|beta|rc|preview|pre)", tag, flags=re.IGNORECASE))
+    return bool(PRERELEASE_TAG_RE.search(tag))
 
 
 def looks_like_version_tag(tag: str) -> bool:
-    return bool(re.match(r"(?i)^(v?\d+(?:\.\d+)*|ver-\d+(?:-\d+)*)$", tag))
+    return bool(VERSION_TAG_RE.match(tag))
+
+
+def latest_info(repo: str, tag: str, html_url: str, source: str) -> dict[str, str]:
+    return {
+        "tag": tag,
+        "tar_url": archive_url_for_tag(repo, tag, "tar.gz"),
+        "zip_url": archive_url_for_tag(repo, tag, "zip"),
+        "html_url": html_url,
+        "source": source,
+    }
+
+
+def select_tag(names: list[str], stable_only: bool) -> str:
+    """First stable version-looking tag in `names` (newest first), else the newest tag."""
+    for candidate in names:
+        if stable_only and is_prerelease_tag(candidate):
+            continue
+        if stable_only and not looks_like_version_tag(candidate):
+            continue
+        return candidate
+    return names[0]
 
 
-def github_latest_release(repo: str, token: str | None) -> dict[str, str] | None:
+def github_latest_release(repo: str, token: str | None, cache: ReleaseCache | None = None) -> dict[str, str] | None:
     url = f"https://api.github.com/repos/{repo}/releases/latest"
     try:
-        data = http_get_json(url, token)
+        data = http_get_json(
+            url, token, cache, keep=lambda d: {"tag_name": d["tag_name"], "html_url": d["html_url"]}
+        )
     except urllib.error.HTTPError as exc:
         if exc.code == 404:
             return None
         raise
-    return {
-        "tag": data["tag_name"],
-        "tar_url": data["tarball_url"],
-        "zip_url": data["zipball_url"],
-        "html_url": data["html_url"],
-        "source": "release",
-    }
+    return latest_info(repo, data["tag_name"], data["html_url"], "release")
 
 
-def github_latest_tag(repo: str, token: str | None, stable_only: bool = True) -> dict[str, str]:
+def github_latest_tag(
+    repo: str, token: str | None, stable_only: bool = True, cache: ReleaseCache | None = None
+) -> dict[str, str]:
     url = f"https://api.github.com/repos/{repo}/tags?per_page=100"
-    data = http_get_json(url, token)
-    if not isinstance(data, list) or not data:
+    names = http_get_json(
+        url, token, cache, keep=lambda d: [item["name"] for item in d] if isinstance(d, list) else []
+    )
+    if not names:
         raise RuntimeError(f"No tags found for {repo}")
-    tag = ""
-    for item in data:
-        candidate = item["name"]
-        if stable_only and is_prerelease_tag(candidate):
-            continue
-        if stable_only and not looks_like_version_tag(candidate):
-            continue
-        tag = candidate
-        break
-    if not tag:
-        tag = data[0]["name"]
-    return {
-        "tag": tag,
-        "tar_url": f"https://api.github.com/repos/{repo}/tarball/{urllib.parse.quote(tag)}",
-        "zip_url": f"https://api.github.com/repos/{repo}/zipball/{urllib.parse.quote(tag)}",
-        "html_url": f"https://github.com/{repo}/tree/{urllib.parse.quote(tag)}",
-        "source": "tag",
-    }
+    tag = select_tag(names, stable_only)
+    return latest_info(repo, tag, f"https://github.com/{repo}/tree/{urllib.parse.quote(tag)}", "tag")
 
 
-def resolve_latest(repo: str, channel: str, token: str | None, allow_prerelease: bool = False) -> dict[str, str]:
+def resolve_latest(
+    repo: str,
+    channel: str,
+    token: str | None,
+    allow_prerelease: bool = False,
+    cache: ReleaseCache | None = None,
+) -> dict[str, str]:
     if channel == "release":
-        rel = github_latest_release(repo, token)
+        rel = github_latest_release(repo, token, cache)
         if rel:
             return rel
-        return github_latest_tag(repo, token, stable_only=not allow_prerelease)
+        return github_latest_tag(repo, token, stable_only=not allow_prerelease, cache=cache)
     if channel == "tag":
-        return github_latest_tag(repo, token, stable_only=not allow_prerelease)
+        return github_latest_tag(repo, token, stable_only=not allow_prerelease, cache=cache)
     raise ValueError(f"Unsupported channel '{channel}' for repo {repo}")
 
 
+class ReleaseCache:
+    """Resolved latest releases (keyed by repo/channel, with a TTL) and API response
+    validators (ETag + the fields we use, keyed by URL) kept on disk between runs.
+
+    Updates stay in memory; save() writes the file once at the end of a run.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS, refresh: bool = False) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._entries: dict[str, Any] | None = None
+        self._dirty = False
+
+    def _load(self) -> dict[str, Any]:
+        if self._entries is None:
+            try:
+                data = json_loads(self.path.read_bytes())
+            except (OSError, ValueError):
+                data = {}
+            self._entries = data if isinstance(data, dict) else {}
+        return self._entries
+
+    def get(self, key: str) -> dict[str, str] | None:
+        if self.refresh:
+            return None
+        with self._lock:
+            entry = self._load().get(key)
+        if not isinstance(entry, dict) or not isinstance(entry.get("value"), dict):
+            return None
+        if time.time() - float(entry.get("time", 0)) > self.ttl_seconds:
+            return None
+        return entry["value"]
+
+    def peek(self, key: str) -> dict[str, Any] | None:
+        """Stored value regardless of age or --refresh (for conditional requests)."""
+        with self._lock:
+            entry = self._load().get(key)
+        if not isinstance(entry, dict) or not isinstance(entry.get("value"), dict):
+            return None
+        return entry["value"]
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._load()[key] = {"time": time.time(), "value": value}
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write pending updates, dropping entries not refreshed for CACHE_MAX_AGE_SECONDS."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            cutoff = time.time() - CACHE_MAX_AGE_SECONDS
+            entries = {
+                key: entry
+                for key, entry in self._entries.items()
+                if isinstance(entry, dict) and float(entry.get("time", 0)) >= cutoff
+            }
+            # A cache that cannot be written only costs a future API call.
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(entries, separators=(",", ":")), encoding="utf-8")
+                os.replace(tmp, self.path)
+            except OSError:
+                return
+            self._entries = entries
+            self._dirty = False
+
+
+def release_cache_key(repo: str, channel: str, allow_prerelease: bool) -> str:
+    return f"{repo}|{channel}|{'prerelease' if allow_prerelease else 'stable'}"
+
+
+def resolve_latest_cached(
+    repo: str, channel: str, token: str | None, cache: ReleaseCache, allow_prerelease: bool = False
+) -> dict[str, str]:
+    key = release_cache_key(repo, channel, allow_prerelease)
+    latest = cache.get(key)
+    if latest is None:
+        latest = resolve_latest(repo, channel, token, allow_prerelease=allow_prerelease, cache=cache)
+        cache.put(key, latest)
+    return latest
+
+
+def github_graphql_latest(libs: dict[str, dict[str, Any]], token: str) -> dict[str, dict[str, str] | Exception]:
+    """Resolve many libraries in one GraphQL request (one aliased field per repo).
+
+    Returns a result or per-library error keyed by library name; libraries with an
+    unknown channel are left out so the REST path reports them.
+    """
+    batch = {
+        name: info for name, info in libs.items() if info.get("channel", "release") in ("release", "tag")
+    }
+    results: dict[str, dict[str, str] | Exception] = {}
+    names = list(batch)
+    for offset in range(0, len(names), GRAPHQL_BATCH_SIZE):
+        chunk = names[offset : offset + GRAPHQL_BATCH_SIZE]
+        fields = []
+        for index, name in enumerate(chunk):
+            owner, _, repo_name = batch[name]["repo"].partition("/")
+            # Same 100 tags, in the same name order, as the REST /tags fallback, so both paths
+            # pick the same tag for the shared release cache key.
+            fields.append(
+                f"r{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo_name)}) {{ "
+                "latestRelease { tagName url } "
+                "refs(first: 100, refPrefix: \"refs/tags/\", "
+                "orderBy: {field: ALPHABETICAL, direction: DESC}) { nodes { name } } }"
+            )
+        query = "query { " + " ".join(fields) + " }"
+        headers = headers_with_optional_token(token)
+        headers["Content-Type"] = "application/json"
+        with http_open(GITHUB_GRAPHQL_URL, headers, "POST", json.dumps({"query": query}).encode("utf-8")) as response:
+            payload = json_loads(response.read())
+        data = payload.get("data") if isinstance(payload, dict) else None
+        if not isinstance(data, dict):
+            raise RuntimeError(f"GraphQL query failed: {payload.get('errors') if isinstance(payload, dict) else payload}")
+
+        for index, name in enumerate(chunk):
+            info = batch[name]
+            repo = info["repo"]
+            node = data.get(f"r{index}")
+            if not isinstance(node, dict):
+                results[name] = RuntimeError(f"Repository not found: {repo}")
+                continue
+            release = node.get("latestRelease")
+            if info.get("channel", "release") == "release" and isinstance(release, dict):
+                results[name] = latest_info(repo, release["tagName"], release["url"], "release")
+                continue
+            tags = [ref["name"] for ref in (node.get("refs") or {}).get("nodes") or []]
+            if not tags:
+                results[name] = RuntimeError(f"No tags found for {repo}")
+                continue
+            tag = select_tag(tags, stable_only=not info.get("allow_prerelease", False))
+            results[name] = latest_info(repo, tag, f"https://github.com/{repo}/tree/{urllib.parse.quote(tag)}", "tag")
+    return results
+
+
 def archive_url_for_tag(repo: str, tag: str, archive_kind: str) -> str:
-    base = f"https://github.com/{repo}/archive/refs/tags/{urllib.parse.quote(tag)}"
+    # codeload serves the archive directly: no API rate-limit cost and no redirect hop.
+    tag = tag.removeprefix("refs/tags/")
+    if archive_kind not in ("tar.gz", "zip"):
+        raise ValueError(f"Unsupported archive kind: {archive_kind}")
+    return f"https://codeload.github.com/{repo}/{archive_kind}/refs/tags/{urllib.parse.quote(tag)}"
+
+
+def api_archive_url_for_tag(repo: str, tag: str, archive_kind: str) -> str:
+    tag = tag.removeprefix("refs/tags/")
     if archive_kind == "tar.gz":
-        return f"{base}.tar.gz"
+        return f"https://api.github.com/repos/{repo}/tarball/{urllib.parse.quote(tag)}"
     if archive_kind == "zip":
-        return f"{base}.zip"
+        return f"https://api.github.com/repos/{repo}/zipball/{urllib.parse.quote(tag)}"
     raise ValueError(f"Unsupported archive kind: {archive_kind}")
 
 
-def download_file(url: str, output_path: Path, token: str | None) -> int:
+def first_available(urls: list[str], action: Callable[[str], Any]) -> Any:
+    """Call `action` with each URL in turn, moving on only when the server answers 404."""
+    for url in urls[:-1]:
+        try:
+            return action(url)
+        except urllib.error.HTTPError as exc:
+            if exc.code != 404:
+                raise
+    return action(urls[-1])
+
+
+def download_file(url: str, output_path: Path, token: str | None, force: bool = False) -> tuple[int, bool]:
+    """Download `url` to `output_path`; returns (size, reused) where `reused` means the
+    existing file was confirmed current (ETag sidecar or matching Content-Length)."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    req = urllib.request.Request(url, headers=headers_with_optional_token(token))
-    total = 0
-    with urllib.request.urlopen(req, timeout=DEFAULT_TIMEOUT_SECONDS) as response, output_path.open("wb") as dst:
-        while True:
-            chunk = response.read(1024 * 64)
-            if not chunk:
-                break
-            dst.write(chunk)
-            total += len(chunk)
-    return total
+    etag_path = output_path.with_name(output_path.name + ".etag")
+    existing_size = output_path.stat().st_size if not force and output_path.is_file() else None
+    headers = headers_with_optional_token(token)
+    if existing_size is not None and etag_path.is_file():
+        headers["If-None-Match"] = etag_path.read_text(encoding="utf-8").strip()
+
+    with http_open(url, headers) as response:
+        if existing_size is not None:
+            length = response.getheader("Content-Length")
+            if response.status == 304 or (
+                "If-None-Match" not in headers and length is not None and length.isdigit() and int(length) == existing_size
+            ):
+                # Leaving a 200 body unread just closes that connection.
+                if response.status == 304:
+                    response.read()
+                elif response.getheader("ETag"):
+                    # Next run can then revalidate with a conditional GET instead of a size probe.
+                    etag_path.write_text(response.getheader("ETag"), encoding="utf-8")
+                return existing_size, True
+
+        # Write under a temporary name so an interrupted download is never reused.
+        etag_path.unlink(missing_ok=True)
+        part_path = output_path.with_name(output_path.name + ".part")
+        with part_path.open("wb") as dst:
+            shutil.copyfileobj(response, dst, COPY_CHUNK_SIZE)
+            size = dst.tell()
+        os.replace(part_path, output_path)
+        etag = response.getheader("ETag")
+
+    if etag:
+        etag_path.write_text(etag, encoding="utf-8")
+    return size, False
+
+
+def archive_member_is_safe(root: str, name: str) -> bool:
+    """True if entry `name` stays inside `root` (an absolute, resolved directory)."""
+    target = os.path.normpath(os.path.join(root, name))
+    return target == root or target.startswith(root + os.sep)
+
+
+def member_filter(prefixes: list[str]) -> Callable[[str], bool] | None:
+    """Match archive entries under any of `prefixes`, whether or not the archive wraps
+    everything in one top-level folder (as GitHub archives do). None means "everything"."""
+    cleaned = [prefix.strip().strip("/") for prefix in prefixes]
+    if not cleaned or any(prefix in ("", ".") for prefix in cleaned):
+        return None
+
+    def wanted(name: str) -> bool:
+        name = name.removeprefix("./")
+        inner = name.partition("/")[2]
+        return any(
+            candidate == prefix or candidate.startswith(prefix + "/")
+            for candidate in (inner, name)
+            for prefix in cleaned
+        )
+
+    return wanted
+
+
+def extract_tar_members(tar: tarfile.TarFile, output_dir: Path, wanted: Callable[[str], bool] | None = None) -> None:
+    # One sequential pass: works on "r|" streams and checks each member as it arrives.
+    root = str(output_dir.resolve())
+    for member in tar:
+        if wanted is not None and not wanted(member.name):
+            continue
+        if not archive_member_is_safe(root, member.name):
+            raise ValueError(f"Blocked unsafe tar entry: {member.name}")
+        tar.extract(member, path=output_dir)
+
+
+# External gzip tools tried in order by --decompressor auto; igzip/pigz inflate much faster than zlib.
+GZIP_DECOMPRESSORS = ("igzip", "pigz")
+# Command used to gunzip tar.gz archives, set from --decompressor; None means Python's gzip module.
+GZIP_COMMAND: list[str] | None = None
+
+
+def configure_gzip_decompressor(choice: str) -> None:
+    global GZIP_COMMAND
+    GZIP_COMMAND = None
+    if choice == "python":
+        return
+    for name in GZIP_DECOMPRESSORS if choice == "auto" else (choice,):
+        exe = shutil.which(name)
+        if exe:
+            GZIP_COMMAND = [exe, "-dc"]
+            return
+    if choice != "auto":
+        raise RuntimeError(f"Decompressor not found on PATH: {choice}")
 
 
-def extract_archive(archive_path: Path, output_dir: Path) -> None:
+def feed_pipe(src: BinaryIO, dst: BinaryIO, errors: list[BaseException]) -> None:
+    try:
+        for block in iter(lambda: src.read(COPY_CHUNK_SIZE), b""):
+            dst.write(block)
+    except BrokenPipeError:
+        pass  # The decompressor exited early; its exit code reports why.
+    except BaseException as exc:
+        errors.append(exc)
+    finally:
+        with contextlib.suppress(OSError):
+            dst.close()
+
+
+@contextlib.contextmanager
+def open_tar_gz(source: Path | BinaryIO) -> Iterator[tarfile.TarFile]:
+    """Open a .tar.gz file or stream as a sequential tar, gunzipped by GZIP_COMMAND when set."""
+    if GZIP_COMMAND is None:
+        if isinstance(source, Path):
+            with tarfile.open(source, "r|gz") as tar:
+                yield tar
+        else:
+            with tarfile.open(fileobj=source, mode="r|gz") as tar:
+                yield tar
+        return
+
+    # Decompression runs in its own process; streamed input is fed to it from a helper thread.
+    feeder = None
+    feed_errors: list[BaseException] = []
+    if isinstance(source, Path):
+        proc = subprocess.Popen([*GZIP_COMMAND, str(source)], stdout=subprocess.PIPE)
+    else:
+        proc = subprocess.Popen(GZIP_COMMAND, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        feeder = threading.Thread(target=feed_pipe, args=(source, proc.stdin, feed_errors), daemon=True)
+        feeder.start()
+    tool = Path(GZIP_COMMAND[0]).name
+    try:
+        with tarfile.open(fileobj=proc.stdout, mode="r|") as tar:
+            yield tar
+        # Drain trailing padding so the decompressor can exit cleanly.
+        while proc.stdout.read(COPY_CHUNK_SIZE):
+            pass
+    except tarfile.TarError as exc:
+        # A truncated tar stream usually means the decompressor gave up; report its exit code instead.
+        with contextlib.suppress(subprocess.TimeoutExpired):
+            proc.wait(timeout=1)
+        if proc.returncode:
+            raise RuntimeError(f"{tool} failed with exit code {proc.returncode}") from exc
+        proc.kill()
+        raise
+    except BaseException:
+        proc.kill()
+        raise
+    finally:
+        proc.stdout.close()
+        proc.wait()
+        if feeder is not None:
+            feeder.join()
+    if feed_errors:
+        raise feed_errors[0]
+    if proc.returncode != 0:
+        raise RuntimeError(f"{tool} failed with exit code {proc.returncode}")
+
+
+def extract_archive_libarchive(
+    archive_path: Path, output_dir: Path, wanted: Callable[[str], bool] | None = None
+) -> None:
+    # Entries are rewritten to absolute paths under output_dir instead of chdir()-ing there:
+    # the working directory is process-wide and shared with the other --jobs workers.
+    flags = (
+        libarchive.extract.EXTRACT_TIME
+        | libarchive.extract.EXTRACT_SECURE_NODOTDOT
+        | libarchive.extract.EXTRACT_SECURE_SYMLINKS
+    )
+    root = str(output_dir.resolve())
+
+    def rooted_entries(entries: Iterator[Any]) -> Iterator[Any]:
+        for entry in entries:
+            name = entry.pathname
+            if wanted is not None and not wanted(name):
+                continue
+            if not archive_member_is_safe(root, name):
+                raise ValueError(f"Blocked unsafe archive entry: {name}")
+            entry.pathname = os.path.normpath(os.path.join(root, name))
+            if entry.islnk:
+                # Hard link targets are archive paths too, so they get the same treatment.
+                if not archive_member_is_safe(root, entry.linkpath):
+                    raise ValueError(f"Blocked unsafe archive link: {name} -> {entry.linkpath}")
+                entry.linkpath = os.path.normpath(os.path.join(root, entry.linkpath))
+            yield entry
+
+    with libarchive.file_reader(str(archive_path)) as entries:
+        libarchive.extract.extract_entries(rooted_entries(entries), flags)
+
+
+def extract_archive(archive_path: Path, output_dir: Path, wanted: Callable[[str], bool] | None = None) -> None:
+    """Extract the archive into `output_dir`; `wanted` limits it to matching entry names."""
     output_dir.mkdir(parents=True, exist_ok=True)
     suffixes = "".join(archive_path.suffixes).lower()
-    if suffixes.endswith(".tar.gz") or suffixes.endswith(".tgz"):
-        with tarfile.open(archive_path, "r:gz") as tar:
-            for member in tar.getmembers():
-                target = (output_dir / member.name).resolve()
-                if output_dir.resolve() not in target.parents and target != output_dir.resolve():
-                    raise ValueError(f"Blocked unsafe tar entry: {member.name}")
-            tar.extractall(path=output_dir)
+    is_tar_gz = suffixes.endswith((".tar.gz", ".tgz"))
+    if libarchive is not None and (suffixes.endswith(".zip") or (is_tar_gz and GZIP_COMMAND is None)):
+        extract_archive_libarchive(archive_path, output_dir, wanted)
+        return
+    if is_tar_gz:
+        with open_tar_gz(archive_path) as tar:
+            extract_tar_members(tar, output_dir, wanted)
         return
     if suffixes.endswith(".zip"):
+        root = str(output_dir.resolve())
         with zipfile.ZipFile(archive_path, "r") as zf:
-            for member in zf.namelist():
-                target = (output_dir / member).resolve()
-                if output_dir.resolve() not in target.parents and target != output_dir.resolve():
-                    raise ValueError(f"Blocked unsafe zip entry: {member}")
-            zf.extractall(path=output_dir)
+            for member in zf.infolist():
+                if wanted is not None and not wanted(member.filename):
+                    continue
+                if not archive_member_is_safe(root, member.filename):
+                    raise ValueError(f"Blocked unsafe zip entry: {member.filename}")
+                zf.extract(member, path=output_dir)
         return
     raise ValueError(f"Unsupported archive format for extraction: {archive_path.name}")
 
 
+def extract_archive_stream(
+    url: str, output_dir: Path, token: str | None, wanted: Callable[[str], bool] | None = None
+) -> None:
+    """Extract a .tar.gz straight from the HTTP response, without a temporary archive file."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with http_open(url, headers_with_optional_token(token)) as response:
+        with open_tar_gz(response) as tar:
+            extract_tar_members(tar, output_dir, wanted)
+        # Drain any trailing padding so the connection can be reused.
+        response.read()
+
+
 def command_list(manifest: dict[str, Any]) -> int:
     libs = dict(sorted(manifest["libraries"].items()))
     print("Tracked third-party sources:")
@@ -273,15 +984,38 @@ def command_list(manifest: dict[str, Any]) -> int:
     return 0
 
 
-def command_check(manifest: dict[str, Any], names: list[str], token: str | None) -> int:
+def command_check(manifest: dict[str, Any], names: list[str], token: str | None, cache: ReleaseCache) -> int:
     libs = select_libraries(manifest, names)
     exit_code = 0
+
+    keys = {
+        name: release_cache_key(info["repo"], info.get("channel", "release"), bool(info.get("allow_prerelease", False)))
+        for name, info in libs.items()
+    }
+
+    # GraphQL needs a token; it answers every uncached library in one round trip.
+    batched: dict[str, dict[str, str] | Exception] = {}
+    if token:
+        pending = {name: info for name, info in libs.items() if cache.get(keys[name]) is None}
+        if pending:
+            try:
+                batched = github_graphql_latest(pending, token)
+            except Exception:  # noqa: BLE001 - fall back to per-library REST lookups
+                batched = {}
+
     for name, info in libs.items():
         repo = info["repo"]
         channel = info.get("channel", "release")
         allow_prerelease = bool(info.get("allow_prerelease", False))
         try:
-            latest = resolve_latest(repo, channel, token, allow_prerelease=allow_prerelease)
+            result = batched.get(name)
+            if isinstance(result, Exception):
+                raise result
+            if result is not None:
+                latest = result
+                cache.put(keys[name], latest)
+            else:
+                latest = resolve_latest_cached(repo, channel, token, cache, allow_prerelease=allow_prerelease)
             print(
                 f"{name:16} latest={latest['tag']:20} source={latest['source']:7} "
                 f"repo={repo} url={latest['html_url']}"
@@ -292,65 +1026,251 @@ def command_check(manifest: dict[str, Any], names: list[str], token: str | None)
     return exit_code
 
 
+def fetch_one_library(
+    name: str,
+    info: dict[str, Any],
+    token: str | None,
+    cache: ReleaseCache,
+    output_dir: Path,
+    archive_kind: str | None,
+    extract: bool,
+    tag: str | None,
+    force: bool = False,
+) -> tuple[bool, list[str]]:
+    repo = info["repo"]
+    default_archive = info.get("default_archive", "tar.gz")
+    chosen_archive = archive_kind or default_archive
+    safe_name = normalize_name(name)
+    lines: list[str] = []
+
+    try:
+        if tag:
+            resolved_tag = tag
+            url = archive_url_for_tag(repo, resolved_tag, chosen_archive)
+            source_kind = "manual-tag"
+        else:
+            latest = resolve_latest_cached(
+                repo,
+                info.get("channel", "release"),
+                token,
+                cache,
+                allow_prerelease=bool(info.get("allow_prerelease", False)),
+            )
+            resolved_tag = latest["tag"]
+            url = latest["tar_url"] if chosen_archive == "tar.gz" else latest["zip_url"]
+            source_kind = latest["source"]
+
+        ext = ".tar.gz" if chosen_archive == "tar.gz" else ".zip"
+        archive_name = normalize_name(f"{safe_name}-{resolved_tag}") + ext
+        archive_path = output_dir / archive_name
+
+        urls = [url, api_archive_url_for_tag(repo, resolved_tag, chosen_archive)]
+        size, reused = first_available(urls, lambda u: download_file(u, archive_path, token, force))
+        lines.append(
+            f"{name:16} {'cached    ' if reused else 'downloaded'} {archive_path} ({size} bytes) "
+            f"tag={resolved_tag} source={source_kind}"
+        )
+
+        if extract:
+            extract_dir = output_dir / normalize_name(f"{safe_name}-{resolved_tag}")
+            extract_archive(archive_path, extract_dir)
+            lines.append(f"{name:16} extracted  {extract_dir}")
+    except Exception as exc:  # noqa: BLE001 - keep batch behavior
+        lines.append(f"{name:16} [error] {describe_error(exc)}")
+        return False, lines
+
+    return True, lines
+
+
 def command_fetch(
     manifest: dict[str, Any],
     names: list[str],
     token: str | None,
+    cache: ReleaseCache,
     output_dir: Path,
     archive_kind: str | None,
     extract: bool,
     tag: str | None,
+    force: bool = False,
+    jobs: int = DEFAULT_JOBS,
 ) -> int:
     libs = select_libraries(manifest, names)
-    exit_code = 0
 
-    for name, info in libs.items():
-        repo = info["repo"]
-        default_archive = info.get("default_archive", "tar.gz")
-        chosen_archive = archive_kind or default_archive
+    def worker(name: str, info: dict[str, Any]) -> tuple[bool, list[str]]:
+        return fetch_one_library(name, info, token, cache, output_dir, archive_kind, extract, tag, force)
+
+    return run_library_jobs(libs, worker, jobs)
+
+
+def sync_one_library(
+    name: str,
+    info: dict[str, Any],
+    token: str | None,
+    cache: ReleaseCache,
+    repo_root: Path,
+    output_dir: Path,
+    archive_kind: str | None,
+    clean: bool,
+    backup_dir: Path | None,
+    tag: str | None,
+    dry_run: bool,
+    stream: bool = False,
+    force: bool = False,
+) -> tuple[bool, list[str]]:
+    module = (info.get("module") or "").strip()
+    if not module:
+        return True, [f"{name:16} [skip] no module mapping (metadata-only entry)."]
+
+    module_dir = (repo_root / "modules" / module).resolve()
+    if not module_dir.is_dir():
+        return False, [f"{name:16} [error] Module directory not found: {module_dir}"]
+
+    repo = info["repo"]
+    chosen_archive = archive_kind or info.get("default_archive", "tar.gz")
+    lines: list[str] = []
+
+    try:
+        if tag:
+            resolved_tag = tag
+            url = archive_url_for_tag(repo, resolved_tag, chosen_archive)
+            source_kind = "manual-tag"
+        else:
+            latest = resolve_latest_cached(
+                repo,
+                info.get("channel", "release"),
+                token,
+                cache,
+                allow_prerelease=bool(info.get("allow_prerelease", False)),
+            )
+            resolved_tag = latest["tag"]
+            url = latest["tar_url"] if chosen_archive == "tar.gz" else latest["zip_url"]
+            source_kind = latest["source"]
+
         safe_name = normalize_name(name)
+        ext = ".tar.gz" if chosen_archive == "tar.gz" else ".zip"
+        archive_name = normalize_name(f"{safe_name}-{resolved_tag}") + ext
+        archive_path = output_dir / archive_name
+        extract_dir = output_dir / "_extract" / normalize_name(f"{safe_name}-{resolved_tag}")
+        stamp = now_stamp()
+        lib_backup_root = backup_dir / module / stamp if backup_dir else None
+
+        if dry_run:
+            lines.append(
+                f"{name:16} [dry-run] module={module} tag={resolved_tag} source={source_kind} "
+                f"archive={archive_path}"
+            )
+            return True, lines
+
+        if extract_dir.exists():
+            remove_path(extract_dir)
+        # Only the copy sources are extracted; docs, tests etc. are never written to disk.
+        explicit = info.get("sync")
+        if isinstance(explicit, dict) and isinstance(explicit.get("copy"), list):
+            wanted = member_filter([str(rule.get("from", "")) for rule in explicit["copy"] if isinstance(rule, dict)])
+        else:
+            wanted = member_filter(["src", "include"])
 
-        try:
-            if tag:
-                resolved_tag = tag
-                url = archive_url_for_tag(repo, resolved_tag, chosen_archive)
-                source_kind = "manual-tag"
-            else:
-                latest = resolve_latest(
-                    repo,
-                    info.get("channel", "release"),
-                    token,
-                    allow_prerelease=bool(info.get("allow_prerelease", False)),
-                )
-                resolved_tag = latest["tag"]
-                url = latest["tar_url"] if chosen_archive == "tar.gz" else latest["zip_url"]
-                source_kind = latest["source"]
-
-            ext = ".tar.gz" if chosen_archive == "tar.gz" else ".zip"
-            archive_name = normalize_name(f"{safe_name}-{resolved_tag}") + ext
-            archive_path = output_dir / archive_name
-
-            size = download_file(url, archive_path, token)
-            print(
-                f"{name:16} downloaded {archive_path} ({size} bytes) "
+        urls = [url, api_archive_url_for_tag(repo, resolved_tag, chosen_archive)]
+        digest: str | None = None
+        if stream and chosen_archive == "tar.gz":
+            first_available(urls, lambda u: extract_archive_stream(u, extract_dir, token, wanted))
+            lines.append(f"{name:16} streamed   {url} tag={resolved_tag} source={source_kind}")
+        else:
+            size, reused = first_available(urls, lambda u: download_file(u, archive_path, token, force))
+            lines.append(
+                f"{name:16} {'cached    ' if reused else 'downloaded'} {archive_path} ({size} bytes) "
                 f"tag={resolved_tag} source={source_kind}"
             )
+            # Same tag, same archive bytes and same sync rules as the last sync: nothing to do.
+            digest = file_sha256(archive_path)
+            previous = read_upstream_stamp(module_dir)
+            if (
+                not force
+                and previous.get("tag") == resolved_tag
+                and previous.get("sha256") == digest
+                and previous.get("sync") == info.get("sync")
+            ):
+                lines.append(f"{name:16} up-to-date {module_dir} (tag={resolved_tag})")
+                return True, lines
+            extract_archive(archive_path, extract_dir, wanted)
+        source_root = detect_extracted_source_root(extract_dir)
+
+        sync_cfg = sync_config_for_library(name, info, source_root)
+        copy_rules = sync_cfg.get("copy", [])
+        if not isinstance(copy_rules, list) or not copy_rules:
+            raise RuntimeError(f"Invalid sync.copy rules for '{name}'")
+
+        clean_targets = sync_cfg.get("clean", [])
+        if not clean_targets:
+            clean_targets = [str(rule.get("to", "")).strip() for rule in copy_rules]
+            clean_targets = [x for x in clean_targets if x]
+        if not isinstance(clean_targets, list):
+            raise RuntimeError(f"Invalid sync.clean rules for '{name}'")
+        clean_targets = unique_in_order([str(x).strip() for x in clean_targets if str(x).strip()])
+
+        # Resolve the roots once; containment checks below are plain string prefix tests.
+        mod_root = str(module_dir) + os.sep
+        source_root = source_root.resolve()
+        src_root = str(source_root) + os.sep
+
+        # From here on the module is being rewritten: a sync that fails halfway must not leave
+        # a stamp claiming it is up to date. The new stamp is written once the copy succeeded.
+        clear_upstream_stamp(module_dir)
+
+        if clean:
+            for rel in clean_targets:
+                target = (module_dir / rel).resolve()
+                if target == module_dir:
+                    raise RuntimeError(f"Refusing to clean module root for '{name}'")
+                if not str(target).startswith(mod_root):
+                    raise RuntimeError(f"Refusing to clean outside module dir: {target}")
+                backup_target = (lib_backup_root / rel) if lib_backup_root else None
+                backup_then_remove(target, backup_target)
+                if target.exists():
+                    raise RuntimeError(f"Failed to clean target: {target}")
+
+        for rule in copy_rules:
+            if not isinstance(rule, dict):
+                raise RuntimeError(f"Invalid sync.copy entry for '{name}': {rule!r}")
+            src_rel = str(rule.get("from", "")).strip()
+            dst_rel = str(rule.get("to", "")).strip()
+            if not src_rel or not dst_rel:
+                raise RuntimeError(f"Invalid sync.copy mapping for '{name}': {rule!r}")
+
+            src_path = (source_root / src_rel).resolve()
+            dst_path = (module_dir / dst_rel).resolve()
+            if src_path != source_root and not str(src_path).startswith(src_root):
+                raise RuntimeError(f"Invalid source path for '{name}': {src_path}")
+            if dst_path != module_dir and not str(dst_path).startswith(mod_root):
+                raise RuntimeError(f"Invalid target path for '{name}': {dst_path}")
+            if not src_path.exists():
+                raise RuntimeError(f"Missing source path in archive: {src_rel}")
+
+            copy_path(src_path, dst_path)
+
+        write_upstream_stamp(
+            module_dir,
+            {
+                "tag": resolved_tag,
+                "sha256": digest,
+                "url": url,
+                "sync": info.get("sync"),
+                "synced_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            },
+        )
+        lines.append(f"{name:16} synced -> {module_dir}")
+    except Exception as exc:  # noqa: BLE001 - keep batch behavior
+        lines.append(f"{name:16} [error] {describe_error(exc)}")
+        return False, lines
 
-            if extract:
-                extract_dir = output_dir / normalize_name(f"{safe_name}-{resolved_tag}")
-                extract_archive(archive_path, extract_dir)
-                print(f"{name:16} extracted  {extract_dir}")
-        except Exception as exc:  # noqa: BLE001 - keep batch behavior
-            print(f"{name:16} [error] {describe_error(exc)}")
-            exit_code = 1
-
-    return exit_code
+    return True, lines
 
 
 def command_sync(
     manifest: dict[str, Any],
     names: list[str],
     token: str | None,
+    cache: ReleaseCache,
     repo_root: Path,
     output_dir: Path,
     archive_kind: str | None,
@@ -358,117 +1278,18 @@ def command_sync(
     backup_dir: Path | None,
     tag: str | None,
     dry_run: bool,
+    stream: bool = False,
+    force: bool = False,
+    jobs: int = DEFAULT_JOBS,
 ) -> int:
     libs = select_libraries(manifest, names)
-    exit_code = 0
-
-    for name, info in libs.items():
-        module = (info.get("module") or "").strip()
-        if not module:
-            print(f"{name:16} [skip] no module mapping (metadata-only entry).")
-            continue
-
-        module_dir = (repo_root / "modules" / module).resolve()
-        if not module_dir.is_dir():
-            print(f"{name:16} [error] Module directory not found: {module_dir}")
-            exit_code = 1
-            continue
-
-        repo = info["repo"]
-        chosen_archive = archive_kind or info.get("default_archive", "tar.gz")
-
-        try:
-            if tag:
-                resolved_tag = tag
-                url = archive_url_for_tag(repo, resolved_tag, chosen_archive)
-                source_kind = "manual-tag"
-            else:
-                latest = resolve_latest(
-                    repo,
-                    info.get("channel", "release"),
-                    token,
-                    allow_prerelease=bool(info.get("allow_prerelease", False)),
-                )
-                resolved_tag = latest["tag"]
-                url = latest["tar_url"] if chosen_archive == "tar.gz" else latest["zip_url"]
-                source_kind = latest["source"]
-
-            safe_name = normalize_name(name)
-            ext = ".tar.gz" if chosen_archive == "tar.gz" else ".zip"
-            archive_name = normalize_name(f"{safe_name}-{resolved_tag}") + ext
-            archive_path = output_dir / archive_name
-            extract_dir = output_dir / "_extract" / normalize_name(f"{safe_name}-{resolved_tag}")
-            stamp = now_stamp()
-            lib_backup_root = backup_dir / module / stamp if backup_dir else None
-
-            if dry_run:
-                print(
-                    f"{name:16} [dry-run] module={module} tag={resolved_tag} source={source_kind} "
-                    f"archive={archive_path}"
-                )
-                continue
 
-            size = download_file(url, archive_path, token)
-            print(
-                f"{name:16} downloaded {archive_path} ({size} bytes) "
-                f"tag={resolved_tag} source={source_kind}"
-            )
-
-            if extract_dir.exists():
-                remove_path(extract_dir)
-            extract_archive(archive_path, extract_dir)
-            source_root = detect_extracted_source_root(extract_dir)
-
-            sync_cfg = sync_config_for_library(name, info, source_root)
-            copy_rules = sync_cfg.get("copy", [])
-            if not isinstance(copy_rules, list) or not copy_rules:
-                raise RuntimeError(f"Invalid sync.copy rules for '{name}'")
-
-            clean_targets = sync_cfg.get("clean", [])
-            if not clean_targets:
-                clean_targets = [str(rule.get("to", "")).strip() for rule in copy_rules]
-                clean_targets = [x for x in clean_targets if x]
-            if not isinstance(clean_targets, list):
-                raise RuntimeError(f"Invalid sync.clean rules for '{name}'")
-            clean_targets = unique_in_order([str(x).strip() for x in clean_targets if str(x).strip()])
-
-            if clean:
-                for rel in clean_targets:
-                    target = (module_dir / rel).resolve()
-                    if target == module_dir:
-                        raise RuntimeError(f"Refusing to clean module root for '{name}'")
-                    if module_dir not in target.parents:
-                        raise RuntimeError(f"Refusing to clean outside module dir: {target}")
-                    backup_target = (lib_backup_root / rel) if lib_backup_root else None
-                    backup_then_remove(target, backup_target)
-                    if target.exists():
-                        raise RuntimeError(f"Failed to clean target: {target}")
-
-            for rule in copy_rules:
-                if not isinstance(rule, dict):
-                    raise RuntimeError(f"Invalid sync.copy entry for '{name}': {rule!r}")
-                src_rel = str(rule.get("from", "")).strip()
-                dst_rel = str(rule.get("to", "")).strip()
-                if not src_rel or not dst_rel:
-                    raise RuntimeError(f"Invalid sync.copy mapping for '{name}': {rule!r}")
-
-                src_path = (source_root / src_rel).resolve()
-                dst_path = (module_dir / dst_rel).resolve()
-                if source_root not in src_path.parents and src_path != source_root:
-                    raise RuntimeError(f"Invalid source path for '{name}': {src_path}")
-                if module_dir not in dst_path.parents and dst_path != module_dir:
-                    raise RuntimeError(f"Invalid target path for '{name}': {dst_path}")
-                if not src_path.exists():
-                    raise RuntimeError(f"Missing source path in archive: {src_rel}")
-
-                copy_path(src_path, dst_path)
-
-            print(f"{name:16} synced -> {module_dir}")
-        except Exception as exc:  # noqa: BLE001 - keep batch behavior
-            print(f"{name:16} [error] {describe_error(exc)}")
-            exit_code = 1
+    def worker(name: str, info: dict[str, Any]) -> tuple[bool, list[str]]:
+        return sync_one_library(
+            name, info, token, cache, repo_root, output_dir, archive_kind, clean, backup_dir, tag, dry_run, stream, force
+        )
 
-    return exit_code
+    return run_library_jobs(libs, worker, jobs)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -483,6 +1304,29 @@ def build_parser() -> argparse.ArgumentParser:
         default="",
         help="Optional GitHub token (or set GITHUB_TOKEN env var) to increase rate limits.",
     )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE_PER_SECOND,
+        help=f"Maximum HTTP requests started per second (default: {DEFAULT_RATE_PER_SECOND:g}; 0 = unlimited).",
+    )
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=DEFAULT_MAX_PARALLEL_REQUESTS,
+        help=f"Maximum concurrent HTTP requests (default: {DEFAULT_MAX_PARALLEL_REQUESTS}).",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help=f"Ignore cached latest-release lookups (kept {DEFAULT_CACHE_TTL_SECONDS // 60} min in {DEFAULT_CACHE_FILE}).",
+    )
+    parser.add_argument(
+        "--decompressor",
+        choices=["auto", *GZIP_DECOMPRESSORS, "python"],
+        default="auto",
+        help="Tool used to gunzip tar.gz archives (default: auto = igzip or pigz if on PATH, else Python).",
+    )
 
     sub = parser.add_subparsers(dest="command", required=True)
 
@@ -504,6 +1348,17 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Force archive format; defaults to library preference in manifest.",
     )
+    fetch.add_argument(
+        "--force",
+        action="store_true",
+        help="Download archives again even if an up-to-date copy exists in --out-dir.",
+    )
+    fetch.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Libraries processed in parallel (default: {DEFAULT_JOBS}).",
+    )
     fetch.add_argument(
         "--tag",
         default=None,
@@ -536,6 +1391,17 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Force archive format; defaults to library preference in manifest.",
     )
+    sync.add_argument(
+        "--force",
+        action="store_true",
+        help="Download and sync again even if the archive in --out-dir and the module are up to date.",
+    )
+    sync.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Libraries processed in parallel (default: {DEFAULT_JOBS}).",
+    )
     sync.add_argument(
         "--tag",
         default=None,
@@ -561,6 +1427,11 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Print planned sync actions without modifying files.",
     )
+    sync.add_argument(
+        "--stream",
+        action="store_true",
+        help="Extract tar.gz archives while downloading instead of keeping a copy in --out-dir.",
+    )
     return parser
 
 
@@ -573,36 +1444,52 @@ def main() -> int:
 
     token = args.github_token or os.environ.get("GITHUB_TOKEN", "")
     token = token.strip() or None
+    cache = ReleaseCache(DEFAULT_CACHE_FILE, refresh=args.refresh)
+    HTTP_LIMITER.configure(args.rate, args.max_parallel)
+    try:
+        configure_gzip_decompressor(args.decompressor)
+    except RuntimeError as exc:
+        parser.error(str(exc))
 
-    if args.command == "list":
-        return command_list(manifest)
-    if args.command == "check":
-        return command_check(manifest, args.libraries, token)
-    if args.command == "fetch":
-        return command_fetch(
-            manifest=manifest,
-            names=args.libraries,
-            token=token,
-            output_dir=Path(args.out_dir).resolve(),
-            archive_kind=args.archive,
-            extract=args.extract,
-            tag=args.tag,
-        )
-    if args.command == "sync":
-        clean = not args.no_clean
-        backup_dir = None if args.no_backup else Path(args.backup_dir).resolve()
-        return command_sync(
-            manifest=manifest,
-            names=args.libraries,
-            token=token,
-            repo_root=Path(args.repo_root).resolve(),
-            output_dir=Path(args.out_dir).resolve(),
-            archive_kind=args.archive,
-            clean=clean,
-            backup_dir=backup_dir,
-            tag=args.tag,
-            dry_run=args.dry_run,
-        )
+    try:
+        if args.command == "list":
+            return command_list(manifest)
+        if args.command == "check":
+            return command_check(manifest, args.libraries, token, cache)
+        if args.command == "fetch":
+            return command_fetch(
+                manifest=manifest,
+                names=args.libraries,
+                token=token,
+                cache=cache,
+                output_dir=Path(args.out_dir).resolve(),
+                archive_kind=args.archive,
+                extract=args.extract,
+                tag=args.tag,
+                force=args.force,
+                jobs=args.jobs,
+            )
+        if args.command == "sync":
+            clean = not args.no_clean
+            backup_dir = None if args.no_backup else Path(args.backup_dir).resolve()
+            return command_sync(
+                manifest=manifest,
+                names=args.libraries,
+                token=token,
+                cache=cache,
+                repo_root=Path(args.repo_root).resolve(),
+                output_dir=Path(args.out_dir).resolve(),
+                archive_kind=args.archive,
+                clean=clean,
+                backup_dir=backup_dir,
+                tag=args.tag,
+                dry_run=args.dry_run,
+                stream=args.stream,
+                force=args.force,
+                jobs=args.jobs,
+            )
+    finally:
+        cache.save()
 
     parser.error(f"Unsupported command: {args.command}")
     return 2
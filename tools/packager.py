@@ -4,24 +4,51 @@ import os
 import sys
 import json
 import shutil
+import tempfile
 import subprocess
 import argparse
 import platform
+import zipfile
+import threading
+import ctypes
+import copy
+import functools
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:  # Opcional: orjson faz o parse de JSON bem mais depressa
+    import orjson
+except ImportError:
+    orjson = None
+
 # =============================================================================
 # CONFIGURAÇÃO E UTILITÁRIOS
 # =============================================================================
 
+@functools.lru_cache(maxsize=64)
+def _load_json_cached(path, mtime_ns, size):
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        return orjson.loads(data) if orjson else json.loads(data)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError herda desta
+        print(f"[ERROR] Failed to parse JSON {path}: {e}")
+        return {}
+
 def load_json(path):
-    if path.exists():
-        with open(path, 'r') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError as e:
-                print(f"[ERROR] Failed to parse JSON {path}: {e}")
-                return {}
-    return {}
+    # Cache por (caminho, mtime, tamanho): main.mk/config.json são lidos por vários packagers.
+    # Devolve uma cópia porque quem chama altera o dict (merge_dicts, cache de toolchain).
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    return copy.deepcopy(_load_json_cached(os.fspath(path), st.st_mtime_ns, st.st_size))
 
 def merge_dicts(base, overlay):
     """Merge recursivo simples para dicionários."""
@@ -47,6 +74,280 @@ def find_tool(name, search_paths):
             return tool
     return None
 
+AndroidTools = namedtuple("AndroidTools", ["aapt", "apksigner", "zipalign", "platform_jar"])
+TOOLCHAIN_CACHE_FILE = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "crosside" / "toolchain.json"
+
+def mtime_ns(path):
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+@functools.lru_cache(maxsize=8)
+def resolve_android_tools(sdk_root, build_tools_version, platform_ver):
+    """Localiza aapt/apksigner/zipalign/android.jar no SDK.
+
+    O resultado fica em memória e em TOOLCHAIN_CACHE_FILE; a entrada em disco só vale
+    enquanto as pastas build-tools/ e platforms/ do SDK não mudarem (mtime).
+    """
+    sdk = Path(sdk_root)
+    key = f"{sdk_root}|{build_tools_version or ''}|{platform_ver}"
+    stamp = [mtime_ns(sdk / "build-tools"), mtime_ns(sdk / "platforms")]
+    cache = load_json(TOOLCHAIN_CACHE_FILE)
+    if not isinstance(cache, dict):
+        cache = {}
+    entry = cache.get(key)
+    if isinstance(entry, dict) and entry.get("stamp") == stamp:
+        tools = entry.get("tools") or {}
+        # Ferramentas em falta voltam a ser procuradas (podem ter sido instaladas entretanto)
+        if all(tools.get(f) for f in AndroidTools._fields):
+            return AndroidTools(*[Path(tools[f]) for f in AndroidTools._fields])
+
+    # Localizar ferramentas
+    if build_tools_version:
+        build_tools = sdk / "build-tools" / build_tools_version
+    else:
+        # Pega a última versão se não especificada
+        build_tools = sorted(list((sdk / "build-tools").glob("*")))[-1]
+
+    # Platform JAR
+    platform_jar = sdk / "platforms" / platform_ver / "android.jar"
+    if not platform_jar.exists():
+        # Fallback para a última disponível (um scandir; ignora nomes sem número de API)
+        try:
+            with os.scandir(sdk / "platforms") as it:
+                levels = [int(e.name[8:]) for e in it if e.name.startswith("android-") and e.name[8:].isdigit()]
+        except OSError:
+            levels = []
+        if levels:
+            platform_jar = sdk / "platforms" / f"android-{max(levels)}" / "android.jar"
+
+    result = AndroidTools(
+        find_tool("aapt", [build_tools]),
+        find_tool("apksigner", [build_tools]),
+        find_tool("zipalign", [build_tools]),
+        platform_jar,
+    )
+    cache[key] = {"stamp": stamp, "tools": {f: str(v) if v else None for f, v in result._asdict().items()}}
+    try:
+        TOOLCHAIN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = TOOLCHAIN_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(cache, indent=2))
+        os.replace(tmp, TOOLCHAIN_CACHE_FILE)
+    except OSError:
+        pass  # Sem cache em disco; a resolução continua válida
+    return result
+
+COPY_CHUNK_SIZE = 1024 * 1024
+SMALL_COPY_CHUNK_SIZE = 64 * 1024
+
+# keytool e apksigner são JVMs de vida curta: só o JIT C1 arranca mais depressa.
+# (keytool passa "-J<opção>" tal e qual; o script do apksigner acrescenta o "-" inicial)
+JVM_FAST_START = "-XX:TieredStopAtLevel=1"
+
+# Debug keystore partilhada do SDK Android (alias androiddebugkey, password android),
+# a mesma que o Gradle/Android Studio criam; se já existir o apksigner usa-a no sítio
+# (nunca é copiada nem escrita) e evita correr o keytool.
+SHARED_DEBUG_KEYSTORE = Path(os.environ.get("ANDROID_USER_HOME") or Path.home() / ".android") / "debug.keystore"
+
+# Extensões que o aapt guarda sem compressão (já vêm comprimidas)
+NO_COMPRESS_EXTS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".wav", ".mp2", ".mp3", ".ogg", ".aac",
+    ".mpg", ".mpeg", ".mid", ".midi", ".smf", ".jet", ".rtttl", ".imy", ".xmf", ".mp4",
+    ".m4a", ".m4v", ".3gp", ".3gpp", ".3g2", ".3gpp2", ".amr", ".awb", ".wma", ".wmv",
+    ".webm", ".mkv",
+}
+FICLONE = 0x40049409  # ioctl de reflink (Btrfs, XFS, bcachefs)
+
+def load_clonefile():
+    if platform.system() != "Darwin":
+        return None
+    try:
+        clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+    except (OSError, AttributeError):
+        return None
+    clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+    clonefile.restype = ctypes.c_int
+    return clonefile
+
+CLONEFILE = load_clonefile()
+
+def fast_copy(src, dst):
+    """Copia src -> dst (conteúdo + permissões): reflink se o FS suportar, senão os.copy_file_range."""
+    if CLONEFILE is not None:
+        # APFS: clone copy-on-write em O(1); clonefile exige que o destino não exista.
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        if CLONEFILE(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return dst
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb") as fdst:
+        st = os.fstat(fsrc.fileno())
+        if st.st_size < SMALL_COPY_CHUNK_SIZE:
+            # Ícones, scripts, .js pequenos: um read e um write, sem tentar reflink/copy_file_range
+            fdst.write(fsrc.read(st.st_size + 1))
+        else:
+            cloned = False
+            if fcntl is not None and sys.platform.startswith("linux"):
+                try:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                    cloned = True
+                except OSError:
+                    pass  # EOPNOTSUPP/EXDEV: FS sem reflink ou volumes diferentes
+            if not cloned:
+                copy_fileobj(fsrc, fdst)
+        if hasattr(os, "fchmod"):
+            os.fchmod(fdst.fileno(), st.st_mode & 0o7777)
+    if not hasattr(os, "fchmod"):
+        shutil.copymode(src, dst)
+    return dst
+
+def copy_fileobj(fsrc, fdst):
+    """Copia o resto de fsrc para fdst (a partir das posições atuais) com os.copy_file_range."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                pass
+            return
+        except OSError:
+            # EXDEV/ENOSYS/EINVAL em kernels ou filesystems sem suporte; continua da posição atual.
+            pass
+    # Buffer de 1 MiB só compensa em ficheiros grandes (.wasm, .so, media); os pequenos ficam nos 64 KiB
+    size = os.fstat(fsrc.fileno()).st_size
+    shutil.copyfileobj(fsrc, fdst, COPY_CHUNK_SIZE if size > COPY_CHUNK_SIZE else SMALL_COPY_CHUNK_SIZE)
+
+def remove_entry(entry):
+    if entry.is_dir(follow_symlinks=False):
+        shutil.rmtree(entry.path)
+    else:
+        os.unlink(entry.path)
+
+def _remove_trees(paths):
+    for p in paths:
+        shutil.rmtree(p, ignore_errors=True)
+
+def remove_tree_async(path):
+    """Move path para uma pasta nova <nome>.trash.* ao lado (O(1)) e apaga-a numa thread.
+
+    A mesma thread apaga o lixo deixado por execuções interrompidas. Devolve a thread ou None.
+    """
+    if not os.path.lexists(path):
+        return None
+    prefix = f"{path.name}.trash."
+    with os.scandir(path.parent) as it:
+        trash = [e.path for e in it if e.name.startswith(prefix) and e.is_dir(follow_symlinks=False)]
+    try:
+        # mkdtemp dá sempre um nome livre (o pid repete-se entre execuções em containers)
+        trash_dir = tempfile.mkdtemp(prefix=prefix, dir=path.parent)
+        os.rename(path, os.path.join(trash_dir, path.name))
+    except OSError:
+        shutil.rmtree(path)
+        return None
+    trash.append(trash_dir)
+    worker = threading.Thread(target=_remove_trees, args=(trash,))
+    worker.start()
+    return worker
+
+def sync_tree(src, dst, old_state, prefix):
+    """Espelha src em dst copiando só os ficheiros cujo (mtime_ns, tamanho) mudou.
+
+    `old_state` vem da execução anterior (chave = prefix/caminho relativo). Devolve
+    (estado novo, nº de ficheiros copiados). O que já não existe em src é apagado de dst.
+    """
+    new_state = {}
+    copied = 0
+    stack = [(os.fspath(src), os.fspath(dst), prefix)]
+    while stack:
+        src_dir, dst_dir, key_dir = stack.pop()
+        os.makedirs(dst_dir, exist_ok=True)
+        with os.scandir(dst_dir) as it:
+            existing = {e.name: e for e in it}
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                is_dir = entry.is_dir()
+                dst_path = os.path.join(dst_dir, entry.name)
+                key = f"{key_dir}/{entry.name}"
+                old = existing.pop(entry.name, None)
+                if old is not None and old.is_dir(follow_symlinks=False) != is_dir:
+                    remove_entry(old)
+                    old = None
+                if is_dir:
+                    stack.append((entry.path, dst_path, key))
+                    continue
+                st = entry.stat()
+                stamp = [st.st_mtime_ns, st.st_size]
+                new_state[key] = stamp
+                if old is None or old_state.get(key) != stamp:
+                    fast_copy(entry.path, dst_path)
+                    copied += 1
+        for stale in existing.values():
+            remove_entry(stale)
+    return new_state, copied
+
+def is_hidden_entry(name, is_dir):
+    """Ficheiros e pastas começados por '.' (.git, .DS_Store, swap files), como o file_packager."""
+    return name.startswith(".")
+
+# Padrão por omissão do aapt para assets:
+# "!.svn:!.git:!.ds_store:!*.scc:.*:<dir>_*:!CVS:!thumbs.db:!picasa.ini:!*~"
+AAPT_IGNORED_NAMES = {"cvs", "thumbs.db", "picasa.ini"}
+
+def aapt_ignores_entry(name, is_dir):
+    """O que o `aapt -A` deixaria de fora do APK."""
+    lower = name.lower()
+    return (name.startswith(".") or lower in AAPT_IGNORED_NAMES or lower.endswith((".scc", "~"))
+            or (is_dir and name.startswith("_")))
+
+def iter_tree_files(root, prefix, ignore=None):
+    """Percorre root com os.scandir (ordem estável); gera (caminho, prefix/caminho relativo em posix).
+
+    ignore(nome, é_pasta) -> True deixa de fora o ficheiro ou a pasta inteira.
+    """
+    stack = [(os.fspath(root), prefix)]
+    while stack:
+        dir_path, dir_key = stack.pop()
+        with os.scandir(dir_path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        subdirs = []
+        for entry in entries:
+            is_dir = entry.is_dir()
+            if ignore and ignore(entry.name, is_dir):
+                continue
+            if is_dir:
+                subdirs.append((entry.path, f"{dir_key}/{entry.name}"))
+            else:
+                yield entry.path, f"{dir_key}/{entry.name}"
+        stack.extend(reversed(subdirs))
+
+def find_abi_libs(roots, abis, lib_name):
+    """Procura <root>/<abi>/lib_name com um scandir por pasta; a primeira raiz que a tiver ganha.
+
+    Devolve {abi: (pasta, [nomes .so da pasta])}.
+    """
+    found = {}
+    for root in roots:
+        try:
+            with os.scandir(root) as it:
+                abi_dirs = [e for e in it if e.name in abis and e.name not in found and e.is_dir()]
+        except OSError:
+            continue
+        for abi_dir in abi_dirs:
+            with os.scandir(abi_dir.path) as it:
+                libs = [e.name for e in it if e.name.endswith(".so")]
+            if lib_name in libs:
+                found[abi_dir.name] = (abi_dir.path, libs)
+    return found
+
+def start_cmd(cmd, cwd=None, env=None):
+    """Como run_cmd, mas não espera pelo processo: o resultado vem de wait_cmd."""
+    print(f"[CMD] {' '.join(str(c) for c in cmd)}")
+    return subprocess.Popen([str(c) for c in cmd], cwd=cwd, env=env)
+
+def wait_cmd(proc):
+    if proc.wait() != 0:
+        print(f"[ERROR] Command failed: {proc.args[0]}")
+        return False
+    return True
+
 def run_cmd(cmd, cwd=None, env=None):
     print(f"[CMD] {' '.join(str(c) for c in cmd)}")
     try:
@@ -60,9 +361,33 @@ def run_cmd(cmd, cwd=None, env=None):
 # ANDROID PACKAGER
 # =============================================================================
 
+# Template do AndroidManifest.xml (preenchido com str.format_map em generate_manifest)
+MANIFEST_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<manifest xmlns:android="http://schemas.android.com/apk/res/android"
+          package="{package}"
+          android:versionCode="1"
+          android:versionName="1.0">
+    <uses-sdk android:minSdkVersion="{min_sdk}" android:targetSdkVersion="{target_sdk}" />
+    <uses-feature android:glEsVersion="0x00020000" android:required="true" />
+    <application android:label="{label}" {icon_attr} android:hasCode="false">
+        <activity android:name="{activity}"
+                  android:label="{label}"
+                  android:configChanges="orientation|keyboardHidden|screenSize"
+                  android:screenOrientation="landscape"
+                  android:exported="true">
+            <meta-data android:name="android.app.lib_name" android:value="{lib_name}" />
+            <intent-filter>
+                <action android:name="android.intent.action.MAIN" />
+                <category android:name="android.intent.category.LAUNCHER" />
+            </intent-filter>
+        </activity>
+    </application>
+</manifest>"""
+
 class AndroidPackager:
-    def __init__(self, repo_root, project_dir, release_config=None, release_name=None):
+    def __init__(self, repo_root, project_dir, release_config=None, release_name=None, regen_keystore=False):
         self.repo_root = repo_root
+        self.regen_keystore = regen_keystore
         self.project_dir = project_dir
         
         # Carregar main.mk e mergear com release.json se existir
@@ -78,27 +403,10 @@ class AndroidPackager:
         tc_config = get_toolchain_config(repo_root)
         self.sdk_root = Path(os.environ.get("ANDROID_SDK_ROOT") or tc_config.get("AndroidSdk") or "")
         self.build_tools_version = tc_config.get("BuildTools")
-        
-        # Localizar ferramentas
-        if self.build_tools_version:
-            build_tools = self.sdk_root / "build-tools" / self.build_tools_version
-        else:
-            # Pega a última versão se não especificada
-            build_tools = sorted(list((self.sdk_root / "build-tools").glob("*")))[-1]
-            
-        self.aapt = find_tool("aapt", [build_tools])
-        self.apksigner = find_tool("apksigner", [build_tools])
-        self.zipalign = find_tool("zipalign", [build_tools])
-        
-        # Platform JAR
         platform_ver = tc_config.get("Platform", "android-31")
-        self.platform_jar = self.sdk_root / "platforms" / platform_ver / "android.jar"
-        if not self.platform_jar.exists():
-             # Fallback para a última disponível
-            platforms = sorted(list((self.sdk_root / "platforms").glob("android-*")), 
-                           key=lambda p: int(p.name.split('-')[-1]))
-            if platforms:
-                self.platform_jar = platforms[-1] / "android.jar"
+
+        tools = resolve_android_tools(str(self.sdk_root), self.build_tools_version, platform_ver)
+        self.aapt, self.apksigner, self.zipalign, self.platform_jar = tools
 
         # Output dirs
         out_folder = release_name if release_name else "Package"
@@ -108,11 +416,13 @@ class AndroidPackager:
         self.assets_dir = self.out_dir / "assets"
         self.lib_dir = self.out_dir / "lib"
         self.tmp_dir = self.out_dir / "tmp"
+        self.removals = []  # threads de remove_tree_async ainda a correr
 
     def prepare_layout(self):
-        if self.out_dir.exists():
-            shutil.rmtree(self.out_dir)
-            
+        # Os assets são sincronizados de forma incremental (ver sync_tree);
+        # res/, lib/ e tmp/ são pequenos e recriados sempre; o apagar corre em fundo (ver stage_content).
+        self.removals = [remove_tree_async(d) for d in [self.res_dir, self.lib_dir, self.tmp_dir]]
+
         for d in [self.res_dir, self.assets_dir, self.lib_dir, self.tmp_dir]:
             d.mkdir(parents=True, exist_ok=True)
             
@@ -123,8 +433,9 @@ class AndroidPackager:
             if src.exists():
                 mipmap = self.res_dir / "mipmap-hdpi"
                 mipmap.mkdir(exist_ok=True)
-                shutil.copy(src, mipmap / "ic_launcher.png")
-        
+                fast_copy(src, mipmap / "ic_launcher.png")
+
+    def stage_content(self):
         # Copiar Assets e Scripts
         content_root = self.project_dir
         if "CONTENT_ROOT" in self.project_spec:
@@ -133,50 +444,75 @@ class AndroidPackager:
             content_root = self.project_dir / self.android_spec["CONTENT_ROOT"]
             
         folders_to_copy = ["scripts", "assets", "resources", "data", "media"]
-        for folder in folders_to_copy:
-            src = content_root / folder
-            if src.exists():
-                print(f"[COPY] {folder} -> assets/{folder}")
-                shutil.copytree(src, self.assets_dir / folder, dirs_exist_ok=True)
 
         # Copiar Bibliotecas Nativas (.so)
         # Assume que já foram compiladas e estão em project/Android/<abi>/lib<name>.so
         abis = ["armeabi-v7a", "arm64-v8a", "x86", "x86_64"]
         found_libs = False
-        
-        for abi in abis:
+
+        cache_file = self.out_dir / ".crosside_cache.json"
+        old_state = load_json(cache_file)
+        if not isinstance(old_state, dict):
+            old_state = {}
+        new_state = {}
+        new_folders = set()
+
+        # As cópias são só IO: pastas de assets e ABIs correm em paralelo, as mensagens saem aqui.
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as ex:
+            futures = {}
+            for folder in folders_to_copy:
+                src = content_root / folder
+                if src.exists():
+                    future = ex.submit(sync_tree, src, self.assets_dir / folder, old_state, f"assets/{folder}")
+                    futures[future] = folder
             # Tenta encontrar no output padrão do builder C++
             # Pode ser project/Android/<abi>/libName.so ou project/bin/Android/<abi>/...
-            lib_name = f"lib{self.name}.so"
-            
-            candidates = [
-                self.project_dir / "Android" / abi / lib_name,
-                self.project_dir / "bin" / "Android" / abi / lib_name,
-                self.project_dir / "libs" / abi / lib_name
+            lib_roots = [
+                self.project_dir / "Android",
+                self.project_dir / "bin" / "Android",
+                self.project_dir / "libs"
             ]
-            
-            src_lib = None
-            for c in candidates:
-                if c.exists():
-                    src_lib = c
-                    break
-            
-            if src_lib:
-                dst_abi = self.lib_dir / abi
-                dst_abi.mkdir(exist_ok=True)
-                shutil.copy(src_lib, dst_abi / lib_name)
-                print(f"[LIB] Found {abi} library: {src_lib}")
-                found_libs = True
-                
-                # Copiar bibliotecas dependentes (se houver, ex: libc++_shared.so)
-                # Aqui assumimos que estão na mesma pasta da lib principal
-                for dep in src_lib.parent.glob("*.so"):
-                    if dep.name != lib_name:
-                        shutil.copy(dep, dst_abi / dep.name)
+            for abi, (src_dir, libs) in find_abi_libs(lib_roots, abis, f"lib{self.name}.so").items():
+                futures[ex.submit(self._stage_abi, abi, src_dir, libs)] = abi
+
+            for future in as_completed(futures):
+                result = future.result()
+                if futures[future] in folders_to_copy:
+                    folder = futures[future]
+                    state, copied = result
+                    new_folders.add(folder)
+                    new_state.update(state)
+                    print(f"[COPY] {folder} -> assets/{folder} ({copied}/{len(state)} files changed)")
+                elif result:
+                    print(f"[LIB] Found {futures[future]} library: {result}")
+                    found_libs = True
+
+        # Pastas que deixaram de existir no projeto
+        with os.scandir(self.assets_dir) as it:
+            for entry in it:
+                if entry.name not in new_folders:
+                    remove_entry(entry)
+
+        with open(cache_file, "w") as f:
+            json.dump(new_state, f)
 
         if not found_libs:
             print(f"[WARNING] No native libraries (.so) found for {self.name}. APK might crash.")
 
+        for worker in self.removals:
+            if worker:
+                worker.join()
+
+    def _stage_abi(self, abi, src_dir, libs):
+        """Copia lib<name>.so de uma ABI e as libs vizinhas; devolve o caminho da lib principal."""
+        dst_abi = os.path.join(os.fspath(self.lib_dir), abi)
+        os.mkdir(dst_abi)
+        # Copiar bibliotecas dependentes (se houver, ex: libc++_shared.so)
+        # Aqui assumimos que estão na mesma pasta da lib principal
+        for name in libs:
+            fast_copy(os.path.join(src_dir, name), os.path.join(dst_abi, name))
+        return os.path.join(src_dir, f"lib{self.name}.so")
+
     def generate_manifest(self):
         package = self.android_spec.get("PACKAGE", "com.example.game")
         activity = self.android_spec.get("ACTIVITY", "android.app.NativeActivity")
@@ -192,31 +528,18 @@ class AndroidPackager:
         if (self.res_dir / "mipmap-hdpi" / "ic_launcher.png").exists():
             icon_attr = 'android:icon="@mipmap/ic_launcher"'
 
-        manifest = f"""<?xml version="1.0" encoding="utf-8"?>
-<manifest xmlns:android="http://schemas.android.com/apk/res/android"
-          package="{package}"
-          android:versionCode="1"
-          android:versionName="1.0">
-    <uses-sdk android:minSdkVersion="{min_sdk}" android:targetSdkVersion="{target_sdk}" />
-    <uses-feature android:glEsVersion="0x00020000" android:required="true" />
-    <application android:label="{label}" {icon_attr} android:hasCode="false">
-        <activity android:name="{activity}"
-                  android:label="{label}"
-                  android:configChanges="orientation|keyboardHidden|screenSize"
-                  android:screenOrientation="landscape"
-                  android:exported="true">
-            <meta-data android:name="android.app.lib_name" android:value="{lib_name}" />
-            <intent-filter>
-                <action android:name="android.intent.action.MAIN" />
-                <category android:name="android.intent.category.LAUNCHER" />
-            </intent-filter>
-        </activity>
-    </application>
-</manifest>"""
+        manifest = MANIFEST_TEMPLATE.format_map({
+            "package": package,
+            "min_sdk": min_sdk,
+            "target_sdk": target_sdk,
+            "label": label,
+            "icon_attr": icon_attr,
+            "activity": activity,
+            "lib_name": lib_name,
+        })
         
         manifest_path = self.out_dir / "AndroidManifest.xml"
-        with open(manifest_path, "w") as f:
-            f.write(manifest)
+        manifest_path.write_bytes(manifest.encode("utf-8"))
         return manifest_path
 
     def package(self):
@@ -228,29 +551,74 @@ class AndroidPackager:
         aligned_apk = self.tmp_dir / f"{self.name}.aligned.apk"
         final_apk = self.out_dir / f"{self.name}.apk"
 
-        # 1. AAPT Package (Resources + Assets + Manifest)
-        # -A assets: adiciona a pasta assets ao APK
+        # 0. Gerar a Debug Key em paralelo com o resto (só precisa dela no passo 4)
+        keystore = self.out_dir / "debug.keystore"
+        keytool_proc = None
+        if self.regen_keystore:
+            keystore.unlink(missing_ok=True)
+        elif not keystore.exists() and SHARED_DEBUG_KEYSTORE.is_file():
+            # Assina direto com a chave partilhada, sem a copiar para a pasta do projeto
+            keystore = SHARED_DEBUG_KEYSTORE
+            print(f"[INFO] Using debug keystore {SHARED_DEBUG_KEYSTORE}")
+        if not keystore.exists():
+            # Tenta usar keytool do Java
+            keytool = "keytool"
+            # Se tiver JAVA_HOME, usa o keytool de lá
+            java_home = os.environ.get("JAVA_HOME")
+            if java_home:
+                keytool = Path(java_home) / "bin" / "keytool"
+
+            keytool_proc = start_cmd([keytool, f"-J{JVM_FAST_START}", "-genkeypair", "-keystore", keystore,
+                                      "-storepass", "android", "-alias", "androiddebugkey",
+                                      "-keypass", "android", "-dname", "CN=Android Debug,O=Android,C=US",
+                                      "-validity", "10000"])
+
+        # 1. AAPT Package (Manifest binário + Resources)
+        # Os assets não precisam de compilação: entram no passo 2 com o zipfile,
+        # por isso o aapt corre enquanto os assets e as libs são copiados.
         cmd = [
             self.aapt, "package", "-f",
             "-M", manifest,
             "-S", self.res_dir,
-            "-A", self.assets_dir,
             "-I", self.platform_jar,
             "-F", unsigned_apk
         ]
-        if not run_cmd(cmd): return
-
-        # 2. Adicionar bibliotecas nativas manualmente (aapt as vezes é chato com libs)
-        # O aapt add espera caminhos relativos.
-        cwd = os.getcwd()
-        os.chdir(self.out_dir)
+        aapt_proc = start_cmd(cmd)
         try:
-            # Adiciona tudo dentro de lib/
-            for lib_file in self.lib_dir.rglob("*.so"):
-                rel_path = lib_file.relative_to(self.out_dir)
-                run_cmd([self.aapt, "add", unsigned_apk.relative_to(self.out_dir), str(rel_path)])
+            self.stage_content()
         finally:
-            os.chdir(cwd)
+            aapt_ok = wait_cmd(aapt_proc)
+            if not aapt_ok and keytool_proc:
+                keytool_proc.wait()
+        if not aapt_ok: return
+
+        # 2. Adicionar assets e bibliotecas nativas num só append ao zip
+        with zipfile.ZipFile(unsigned_apk, "a", zipfile.ZIP_STORED) as apk:
+            # O que o aapt já pôs no APK não é escrito outra vez (o diretório central já está lido)
+            existing = set(apk.namelist())
+
+            # Assets: deflate rápido, exceto formatos já comprimidos (mesma lista do aapt);
+            # ficam de fora os mesmos ficheiros que o `aapt -A` ignorava
+            for path, arcname in iter_tree_files(self.assets_dir, "assets", ignore=aapt_ignores_entry):
+                if arcname in existing:
+                    continue
+                if os.path.splitext(arcname)[1].lower() in NO_COMPRESS_EXTS:
+                    apk.write(path, arcname, zipfile.ZIP_STORED)
+                else:
+                    apk.write(path, arcname, zipfile.ZIP_DEFLATED, compresslevel=1)
+
+            # Bibliotecas nativas (aapt as vezes é chato com libs)
+            # As libs ficam STORED para o Android as poder mapear direto do APK depois do zipalign.
+            for lib_file, arcname in iter_tree_files(self.lib_dir, "lib"):
+                if not arcname.endswith(".so") or arcname in existing:
+                    continue
+                info = zipfile.ZipInfo.from_file(lib_file, arcname)
+                info.compress_type = zipfile.ZIP_STORED
+                info.external_attr = 0o100755 << 16
+                with open(lib_file, "rb") as src, apk.open(info, "w") as dst:
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE if info.file_size > COPY_CHUNK_SIZE
+                                       else SMALL_COPY_CHUNK_SIZE)
+                print(f"[LIB] {info.filename}")
 
         # 3. Zipalign (Otimização importante para Android)
         if self.zipalign:
@@ -261,21 +629,10 @@ class AndroidPackager:
             target_apk_for_signing = unsigned_apk
 
         # 4. Assinar APK (Debug Key)
-        keystore = self.out_dir / "debug.keystore"
-        if not keystore.exists():
-            # Tenta usar keytool do Java
-            keytool = "keytool"
-            # Se tiver JAVA_HOME, usa o keytool de lá
-            java_home = os.environ.get("JAVA_HOME")
-            if java_home:
-                keytool = Path(java_home) / "bin" / "keytool"
-            
-            run_cmd([keytool, "-genkeypair", "-keystore", keystore,
-                     "-storepass", "android", "-alias", "androiddebugkey",
-                     "-keypass", "android", "-dname", "CN=Android Debug,O=Android,C=US",
-                     "-validity", "10000"])
+        if keytool_proc:
+            wait_cmd(keytool_proc)
 
-        run_cmd([self.apksigner, "sign", "--ks", keystore,
+        run_cmd([self.apksigner, f"-J{JVM_FAST_START[1:]}", "sign", "--ks", keystore,
                  "--ks-pass", "pass:android",
                  "--out", final_apk, target_apk_for_signing])
         
@@ -285,9 +642,85 @@ class AndroidPackager:
 # WEB PACKAGER
 # =============================================================================
 
+# Loader do .data no formato do file_packager do Emscripten (--preload + --no-heap-copy)
+DATA_LOADER_TEMPLATE = """var Module = typeof Module != "undefined" ? Module : {};
+(function() {
+  var PACKAGE_NAME = "@PACKAGE_NAME@";
+  var REMOTE_PACKAGE_NAME = Module["locateFile"] ? Module["locateFile"](PACKAGE_NAME, "") : PACKAGE_NAME;
+  var metadata = @METADATA@;
+
+  function runWithFS() {
+    metadata.dirs.forEach(function(dir) {
+      var slash = dir.lastIndexOf("/");
+      Module["FS_createPath"](dir.substring(0, slash) || "/", dir.substring(slash + 1), true, true);
+    });
+    Module["addRunDependency"]("datafile_" + PACKAGE_NAME);
+    fetch(REMOTE_PACKAGE_NAME)
+      .then(function(response) {
+        if (!response.ok) throw new Error(response.status + " : " + response.url);
+        return response.arrayBuffer();
+      })
+      .then(function(buffer) {
+        var bytes = new Uint8Array(buffer);
+        metadata.files.forEach(function(file) {
+          Module["FS_createDataFile"](file.filename, null, bytes.subarray(file.start, file.end), true, true, true);
+        });
+        Module["removeRunDependency"]("datafile_" + PACKAGE_NAME);
+      })
+      .catch(function(error) {
+        console.error("Failed to load " + PACKAGE_NAME + ": " + error);
+        throw error;
+      });
+  }
+
+  if (Module["calledRun"]) {
+    runWithFS();
+  } else {
+    if (!Module["preRun"]) Module["preRun"] = [];
+    Module["preRun"].push(runWithFS);
+  }
+})();
+"""
+
+class DataPackageWriter:
+    """Escreve o <name>.data (ficheiros concatenados) e o loader .data.js sem correr o file_packager."""
+
+    def __init__(self, data_path):
+        self.data_path = data_path
+        self.fp = open(data_path, "wb", buffering=0)
+        self.files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        # Fecha o .data mesmo se um append falhar a meio
+        self.fp.close()
+
+    def append(self, src, virtual_path):
+        start = self.fp.tell()
+        with open(src, "rb") as fsrc:
+            copy_fileobj(fsrc, self.fp)
+        self.files.append({"filename": virtual_path, "start": start, "end": self.fp.tell()})
+
+    def finish(self, js_path):
+        size = self.fp.tell()
+        self.fp.close()
+        dirs = set()
+        for f in self.files:
+            parent = f["filename"].rsplit("/", 1)[0]
+            while parent and parent not in dirs:
+                dirs.add(parent)
+                parent = parent.rsplit("/", 1)[0]
+        metadata = {"files": self.files, "dirs": sorted(dirs), "remote_package_size": size}
+        loader = DATA_LOADER_TEMPLATE.replace("@PACKAGE_NAME@", self.data_path.name)
+        loader = loader.replace("@METADATA@", json.dumps(metadata))
+        js_path.write_bytes(loader.encode("utf-8"))
+
 class WebPackager:
-    def __init__(self, repo_root, project_dir, release_config=None, release_name=None):
+    def __init__(self, repo_root, project_dir, release_config=None, release_name=None, legacy_file_packager=False):
         self.repo_root = repo_root
+        self.legacy_file_packager = legacy_file_packager
         self.project_dir = project_dir
         self.project_spec = load_json(project_dir / "main.mk")
         if release_config:
@@ -300,44 +733,78 @@ class WebPackager:
 
     def package(self):
         print(f"Packaging Web build for {self.name}...")
-        
-        if self.out_dir.exists():
-            shutil.rmtree(self.out_dir)
+
+        # O deploy anterior é apagado em fundo enquanto o novo é gerado
+        removal = remove_tree_async(self.out_dir)
         self.out_dir.mkdir(parents=True, exist_ok=True)
 
         # 1. Copiar binários Web (HTML, JS, WASM, DATA)
         # Procura por arquivos gerados pelo build C++
         extensions = [".html", ".js", ".wasm"] # .data será gerado novamente
         found_binary = False
-        
-        for ext in extensions:
-            # Tenta encontrar com o nome do projeto ou index
-            candidates = [
-                self.src_web_dir / f"{self.name}{ext}",
-                self.src_web_dir / f"index{ext}",
-                self.src_web_dir / f"main{ext}"
-            ]
-            for c in candidates:
-                if c.exists():
-                    shutil.copy(c, self.out_dir / c.name)
-                    print(f"[COPY] {c.name}")
-                    found_binary = True
+
+        # Tenta encontrar com o nome do projeto ou index (um só scandir da pasta Web)
+        candidates = [f"{stem}{ext}" for ext in extensions for stem in (self.name, "index", "main")]
+        try:
+            with os.scandir(self.src_web_dir) as it:
+                present = {e.name: e.path for e in it if e.name in candidates and e.is_file()}
+        except OSError:
+            present = {}
+        for name in candidates:
+            if name in present:
+                fast_copy(present[name], self.out_dir / name)
+                print(f"[COPY] {name}")
+                found_binary = True
 
         if not found_binary:
             print(f"[WARNING] No Web build artifacts found in {self.src_web_dir}. Did you build C++ first?")
 
         # 2. Empacotar Assets (file_packager)
         self.package_assets()
+        if removal:
+            removal.join()
 
         print(f"[SUCCESS] Web deploy created: {self.out_dir}")
 
     def package_assets(self):
+        data_file = self.out_dir / f"{self.name}.data"
+        js_file = self.out_dir / f"{self.name}.data.js"
+
+        content_root = self.project_dir
+        if "CONTENT_ROOT" in self.project_spec:
+            content_root = self.project_dir / self.project_spec["CONTENT_ROOT"]
+        elif "Web" in self.project_spec and "CONTENT_ROOT" in self.project_spec["Web"]:
+            content_root = self.project_dir / self.project_spec["Web"]["CONTENT_ROOT"]
+
+        folders_to_pack = ["scripts", "assets", "resources", "data", "media"]
+        sources = [(content_root / folder, folder) for folder in folders_to_pack if (content_root / folder).exists()]
+        if not sources:
+            print("[INFO] No assets found to package.")
+            return
+
+        if self.legacy_file_packager:
+            ok = self.run_file_packager(sources, data_file, js_file)
+        else:
+            # Mesmo formato do file_packager --preload --no-heap-copy (que também ignora ficheiros
+            # escondidos), sem lançar outro Python
+            with DataPackageWriter(data_file) as writer:
+                for src, folder in sources:
+                    for path, virtual_path in iter_tree_files(src, f"/{folder}", ignore=is_hidden_entry):
+                        writer.append(path, virtual_path)
+                writer.finish(js_file)
+            ok = True
+
+        if ok:
+            print(f"[PACK] Generated {data_file.name} and {js_file.name}")
+            print(f"[INFO] NOTE: Ensure {js_file.name} is loaded in your HTML.")
+
+    def run_file_packager(self, sources, data_file, js_file):
         tc_config = get_toolchain_config(self.repo_root)
         emsdk_path = os.environ.get("EMSDK") or tc_config.get("Emsdk")
         
         if not emsdk_path:
             print("[ERROR] EMSDK path not found in config.json or env. Cannot package assets.")
-            return
+            return False
 
         emsdk = Path(emsdk_path)
         # Tenta localizar file_packager.py
@@ -347,38 +814,16 @@ class WebPackager:
         
         if not file_packager.exists():
             print(f"[ERROR] file_packager.py not found in {emsdk}")
-            return
-
-        data_file = self.out_dir / f"{self.name}.data"
-        js_file = self.out_dir / f"{self.name}.data.js"
-        
-        content_root = self.project_dir
-        if "CONTENT_ROOT" in self.project_spec:
-            content_root = self.project_dir / self.project_spec["CONTENT_ROOT"]
-        elif "Web" in self.project_spec and "CONTENT_ROOT" in self.project_spec["Web"]:
-            content_root = self.project_dir / self.project_spec["Web"]["CONTENT_ROOT"]
+            return False
 
         cmd = [sys.executable, str(file_packager), str(data_file)]
-        
-        folders_to_pack = ["scripts", "assets", "resources", "data", "media"]
-        has_assets = False
-        
-        for folder in folders_to_pack:
-            src = content_root / folder
-            if src.exists():
-                cmd.append(f"--preload")
-                cmd.append(f"{src}@{folder}")
-                has_assets = True
-        
-        if has_assets:
-            cmd.append(f"--js-output={js_file}")
-            cmd.append("--no-heap-copy")
-            print(f"[PACK] Running file_packager...")
-            if run_cmd(cmd):
-                print(f"[PACK] Generated {data_file.name} and {js_file.name}")
-                print(f"[INFO] NOTE: Ensure {js_file.name} is loaded in your HTML.")
-        else:
-            print("[INFO] No assets found to package.")
+        for src, folder in sources:
+            cmd.append(f"--preload")
+            cmd.append(f"{src}@{folder}")
+        cmd.append(f"--js-output={js_file}")
+        cmd.append("--no-heap-copy")
+        print(f"[PACK] Running file_packager...")
+        return run_cmd(cmd)
 
 # =============================================================================
 # MAIN
@@ -389,6 +834,10 @@ if __name__ == "__main__":
     parser.add_argument("project", help="Path to project folder")
     parser.add_argument("target", choices=["android", "web"], help="Target platform")
     parser.add_argument("--release", help="Path to release.json configuration file", default=None)
+    parser.add_argument("--regen-keystore", action="store_true",
+                        help="Android: generate a new debug keystore with keytool instead of reusing one")
+    parser.add_argument("--legacy-file-packager", action="store_true",
+                        help="Web: build the .data bundle with Emscripten's file_packager.py instead of the built-in writer")
     args = parser.parse_args()
 
     repo_root = Path(__file__).parent.parent.resolve()
@@ -411,8 +860,10 @@ if __name__ == "__main__":
             sys.exit(1)
 
     if args.target == "android":
-        packager = AndroidPackager(repo_root, project_path, release_config, release_name)
+        packager = AndroidPackager(repo_root, project_path, release_config, release_name,
+                                   regen_keystore=args.regen_keystore)
         packager.package()
     elif args.target == "web":
-        packager = WebPackager(repo_root, project_path, release_config, release_name)
+        packager = WebPackager(repo_root, project_path, release_config, release_name,
+                               legacy_file_packager=args.legacy_file_packager)
         packager.package()
@@ -0,0 +1,76 @@
+import io
+import os
+import sys
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import fetch_third_party_release as fetch  # noqa: E402
+
+
+def write_tar_gz(path, members):
+    """members: (name, kind, data_or_link) com kind em "file", "symlink" ou "hardlink"."""
+    with tarfile.open(path, "w:gz") as tar:
+        for name, kind, value in members:
+            info = tarfile.TarInfo(name)
+            if kind == "file":
+                info.size = len(value)
+                tar.addfile(info, io.BytesIO(value))
+                continue
+            info.type = tarfile.SYMTYPE if kind == "symlink" else tarfile.LNKTYPE
+            info.linkname = value
+            tar.addfile(info)
+
+
+@unittest.skipIf(fetch.libarchive is None, "libarchive-c não está instalado")
+class ExtractArchiveLibarchiveTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.archive = self.root / "lib-v1.tar.gz"
+        self.out = self.root / "work" / "out"
+        self.out.mkdir(parents=True)
+
+    def test_entries_are_extracted_under_output_dir(self):
+        write_tar_gz(self.archive, [
+            ("top/src/a.c", "file", b"int a;"),
+            ("top/src/alias.c", "symlink", "a.c"),
+            ("top/src/copy.c", "hardlink", "top/src/a.c"),
+            ("top/docs/readme.md", "file", b"docs"),
+        ])
+        cwd = os.getcwd()
+
+        fetch.extract_archive_libarchive(self.archive, self.out, fetch.member_filter(["src"]))
+
+        self.assertEqual(os.getcwd(), cwd)
+        src = self.out / "top" / "src"
+        self.assertEqual((src / "a.c").read_bytes(), b"int a;")
+        # O alvo do symlink fica relativo; só os nomes das entradas passam a absolutos
+        self.assertEqual(os.readlink(src / "alias.c"), "a.c")
+        self.assertEqual((src / "alias.c").read_bytes(), b"int a;")
+        self.assertTrue((src / "copy.c").samefile(src / "a.c"))
+        self.assertFalse((self.out / "top" / "docs").exists())
+
+    def test_entry_escaping_output_dir_is_blocked(self):
+        write_tar_gz(self.archive, [("top/../../evil.txt", "file", b"evil")])
+
+        with self.assertRaises(ValueError):
+            fetch.extract_archive_libarchive(self.archive, self.out)
+        self.assertFalse((self.root / "evil.txt").exists())
+        self.assertFalse((self.root / "work" / "evil.txt").exists())
+
+    def test_hard_link_escaping_output_dir_is_blocked(self):
+        (self.root / "work" / "secret.txt").write_text("secret")
+        write_tar_gz(self.archive, [("top/leak.txt", "hardlink", "../secret.txt")])
+
+        with self.assertRaises(ValueError):
+            fetch.extract_archive_libarchive(self.archive, self.out)
+        self.assertFalse((self.out / "top" / "leak.txt").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import packager  # noqa: E402
+
+# Ferramentas do SDK falsas: o suficiente para o AndroidPackager chegar ao APK final
+FAKE_TOOLS = {
+    "build-tools/34.0.0/aapt": """
+import sys, zipfile
+out = sys.argv[sys.argv.index("-F") + 1]
+with zipfile.ZipFile(out, "w") as z:
+    z.write(sys.argv[sys.argv.index("-M") + 1], "AndroidManifest.xml")
+""",
+    "build-tools/34.0.0/zipalign": """
+import shutil, sys
+shutil.copyfile(sys.argv[-2], sys.argv[-1])
+""",
+    "build-tools/34.0.0/apksigner": """
+import json, os, shutil, sys
+args = sys.argv[1:]
+shutil.copyfile(args[-1], args[args.index("--out") + 1])
+with open(os.path.join(os.path.dirname(__file__), "apksigner.json"), "w") as f:
+    json.dump(args, f)
+""",
+    "jdk/bin/keytool": """
+import sys
+with open(sys.argv[sys.argv.index("-keystore") + 1], "w") as f:
+    f.write("generated")
+""",
+}
+
+
+@unittest.skipIf(os.name == "nt", "ferramentas falsas são scripts POSIX")
+class AndroidPackagerTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+        sdk = self.root / "sdk"
+        self.apksigner_log = sdk / "build-tools" / "34.0.0" / "apksigner.json"
+        for rel, body in FAKE_TOOLS.items():
+            tool = (self.root / "jdk" if rel.startswith("jdk/") else sdk) / rel.removeprefix("jdk/")
+            tool.parent.mkdir(parents=True, exist_ok=True)
+            tool.write_text(f"#!{sys.executable}\n{body}")
+            tool.chmod(0o755)
+        (sdk / "platforms" / "android-34").mkdir(parents=True)
+        (sdk / "platforms" / "android-34" / "android.jar").write_bytes(b"")
+
+        self.repo = self.root / "repo"
+        self.repo.mkdir()
+        toolchain = {"AndroidSdk": str(sdk), "BuildTools": "34.0.0", "Platform": "android-34"}
+        (self.repo / "config.json").write_text(json.dumps({"Configuration": {"Toolchain": toolchain}}))
+
+        self.project = self.root / "game"
+        (self.project / "assets").mkdir(parents=True)
+        (self.project / "main.mk").write_text(json.dumps({"Name": "game"}))
+        (self.project / "assets" / "level.txt").write_text("level")
+
+        self.shared_keystore = self.root / "android_home" / "debug.keystore"
+        for patch in (
+            mock.patch.object(packager, "TOOLCHAIN_CACHE_FILE", self.root / "toolchain.json"),
+            mock.patch.object(packager, "SHARED_DEBUG_KEYSTORE", self.shared_keystore),
+            mock.patch.dict(os.environ, {"JAVA_HOME": str(self.root / "jdk")}),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+        os.environ.pop("ANDROID_SDK_ROOT", None)
+        packager.resolve_android_tools.cache_clear()
+
+    def package(self):
+        packager.AndroidPackager(self.repo, self.project).package()
+        with zipfile.ZipFile(self.project / "Android" / "Package" / "game.apk") as apk:
+            return set(apk.namelist())
+
+    def test_assets_ignored_by_aapt_stay_out_of_apk(self):
+        assets = self.project / "assets"
+        (assets / ".hidden").write_text("x")
+        (assets / "level.txt~").write_text("x")
+        (assets / "Thumbs.db").write_text("x")
+        (assets / ".git").mkdir()
+        (assets / ".git" / "HEAD").write_text("x")
+        (assets / "_drafts").mkdir()
+        (assets / "_drafts" / "wip.txt").write_text("x")
+
+        names = self.package()
+
+        self.assertIn("assets/assets/level.txt", names)
+        self.assertEqual([n for n in names if n.startswith("assets/")], ["assets/assets/level.txt"])
+
+    def signing_keystore(self):
+        args = json.loads(self.apksigner_log.read_text())
+        return Path(args[args.index("--ks") + 1])
+
+    def test_shared_debug_keystore_is_used_in_place(self):
+        self.shared_keystore.parent.mkdir()
+        self.shared_keystore.write_text("shared")
+
+        self.package()
+
+        self.assertEqual(self.signing_keystore(), self.shared_keystore)
+        self.assertFalse((self.project / "Android" / "Package" / "debug.keystore").exists())
+
+    def test_generated_keystore_stays_in_project(self):
+        self.package()
+
+        project_keystore = self.project / "Android" / "Package" / "debug.keystore"
+        self.assertEqual(self.signing_keystore(), project_keystore)
+        self.assertEqual(project_keystore.read_text(), "generated")
+        self.assertFalse(self.shared_keystore.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()